@@ -28,6 +28,7 @@ gi.require_version("Gtk", "3.0")
 from gi.repository import Gtk
 
 from gettext import gettext
+from typing import Optional
 from core.utils import logger
 
 import pygame
@@ -108,6 +109,36 @@ class BasicMathsActivity(Activity):
         self.set_toolbar_box(toolbar_box)
         toolbar_box.show()
 
+    def get_preview(self) -> Optional[bytes]:
+        """Return the Journal preview, rendered from the game screen
+
+        Returns:
+            Optional[bytes]: PNG data, None before the screen exists.
+        """
+
+        return self.game_canvas.get_preview()
+
+    def read_file(self, file_path: str) -> None:
+        """Resume the learner's progress from the Journal
+
+        Args:
+            file_path (str): Progress snapshot stored in the Journal.
+        """
+
+        self.game_instance.load_progress(file_path)
+
+    def write_file(self, file_path: str) -> None:
+        """Save the learner's progress to the Journal. Attempts are appended
+        to a log in the activity's data directory, the Journal only keeps a
+        small snapshot of the learner model.
+
+        Args:
+            file_path (str): File the Journal stores.
+        """
+
+        self.metadata["mime_type"] = "application/maths-activity"
+        self.game_instance.save_progress(file_path)
+
     def stop(self, button: StopButton) -> None:
         """Stop the running activity instance. Also stops all child processes
 
@@ -0,0 +1,105 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Run the benchmark suite headless and optionally compare with an earlier run::
+
+    python -m benchmarks -o after.json --compare before.json
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+from core.headless import BUNDLE_ROOT, HeadlessActivity, init_display
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run the benchmark suite.")
+    parser.add_argument("-o", "--output", help="JSON file to write results to")
+    parser.add_argument("--compare", help="JSON results of an earlier run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative slowdown reported as a regression, defaults to 0.1",
+    )
+    parser.add_argument(
+        "--size", default="1200x900", help="screen size, defaults to 1200x900"
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="multiplier for the number of iterations",
+    )
+    parser.add_argument("filters", nargs="*", help="only run matching benchmarks")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    baseline_path = os.path.abspath(args.compare) if args.compare else None
+    os.chdir(BUNDLE_ROOT)
+
+    width, height = (int(value) for value in args.size.lower().split("x"))
+    screen = init_display((width, height))
+
+    # Imported late, the cases load sprites relative to the bundle root
+    from benchmarks import cases, harness
+    from core.game import Game
+
+    game = Game(HeadlessActivity(), headless=True)
+    game.setup()
+
+    results = harness.run(
+        {"screen": screen, "game": game, "tmp": tempfile.mkdtemp(prefix="basicmaths-")},
+        args.filters,
+        args.scale,
+    )
+
+    for name, result in results["results"].items():
+        if "skipped" in result:
+            print(f"{name:40} skipped: {result['skipped']}")
+        else:
+            print(
+                f"{name:40} {result['median'] * 1e6:12.2f} us"
+                f" (min {result['min'] * 1e6:.2f}, stdev {result['stdev'] * 1e6:.2f})"
+            )
+
+    if output:
+        harness.save(results, output)
+
+    if baseline_path:
+        regressions = 0
+        print()
+        for row in harness.compare(harness.load(baseline_path), results, args.threshold):
+            regressions += row["regression"]
+            print(
+                f"{row['name']:40} {row['ratio']:6.2f}x"
+                f"{'  REGRESSION' if row['regression'] else ''}"
+            )
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
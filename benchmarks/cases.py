@@ -0,0 +1,256 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Benchmark cases for asset loading, widgets, event translation and frames"""
+
+import os
+from typing import Dict
+
+import pygame
+
+from benchmarks.harness import benchmark
+from core.ui import (
+    font_manager,
+    GameButton,
+    GAME_BACKGROUND_PATH,
+    glyph_renderer,
+    GlyphText,
+    load_sprite,
+    ScaledSpriteCache,
+    ShapeRenderer,
+    ShapeSpec,
+    sprite_cache,
+    TextBox,
+)
+
+SPRITE_SCALES = {"0.5": 0.5, "1.0": 1.0, "xo": 1200 / 640}
+EVENT_BATCH = 100
+
+
+def _register_sprite_cases(label: str, scale: float) -> None:
+    @benchmark(f"sprite.load.cold[scale={label}]", number=20, repeat=5)
+    def load_cold(context: Dict):
+        def operation():
+            sprite_cache.clear()
+            load_sprite(GAME_BACKGROUND_PATH, scale_x=scale, scale_y=scale)
+
+        return operation, 1
+
+    @benchmark(f"sprite.load.prescaled[scale={label}]", number=20, repeat=5)
+    def load_prescaled(context: Dict):
+        cache = ScaledSpriteCache(os.path.join(context["tmp"], "sprites"))
+
+        def operation():
+            cache.load(GAME_BACKGROUND_PATH, scale_x=scale, scale_y=scale)
+
+        return operation, 1
+
+    @benchmark(f"sprite.load.warm[scale={label}]", number=20, repeat=5)
+    def load_warm(context: Dict):
+        def operation():
+            load_sprite(GAME_BACKGROUND_PATH, scale_x=scale, scale_y=scale)
+
+        return operation, 1
+
+
+for _label, _scale in SPRITE_SCALES.items():
+    _register_sprite_cases(_label, _scale)
+
+
+@benchmark("shape.render.cold", number=200)
+def shape_render_cold(context: Dict):
+    renderer = ShapeRenderer()
+    state = {"rotation": 0}
+
+    def operation():
+        # A new rotation every call, so every render is a cache miss
+        state["rotation"] = (state["rotation"] + 0.1) % 72
+        renderer.render(ShapeSpec("star", 120, (230, 57, 70), state["rotation"]))
+
+    return operation, 1
+
+
+@benchmark("shape.render.warm", number=200)
+def shape_render_warm(context: Dict):
+    renderer = ShapeRenderer()
+    spec = ShapeSpec("star", 120, (230, 57, 70), 10)
+    return lambda: renderer.render(spec), 1
+
+
+@benchmark("widget.textbox.construct", number=200)
+def textbox_construct(context: Dict):
+    font = context["game"].font
+    return lambda: TextBox("Select the correct shape", 320, 240, font=font), 1
+
+
+@benchmark("widget.button.construct", number=200)
+def button_construct(context: Dict):
+    font = context["game"].font
+    return lambda: GameButton("Play", 320, 240, font=font), 1
+
+
+def _timer_texts():
+    return ["%02d:%02d" % divmod(second, 60) for second in range(3600)]
+
+
+@benchmark("text.counter.font", number=500)
+def counter_font(context: Dict):
+    font = font_manager.get(size=24)
+    texts, state = _timer_texts(), {"index": 0}
+
+    def operation():
+        state["index"] = (state["index"] + 1) % len(texts)
+        font.render(texts[state["index"]], True, (0, 0, 0))
+
+    return operation, 1
+
+
+@benchmark("text.counter.glyphs", number=500)
+def counter_glyphs(context: Dict):
+    counter = GlyphText("00:00", 320, 240, font=font_manager.get(size=24))
+    texts, state = _timer_texts(), {"index": 0}
+
+    def operation():
+        state["index"] = (state["index"] + 1) % len(texts)
+        counter.set_text(texts[state["index"]])
+
+    return operation, 1
+
+
+@benchmark("text.equation.glyphs", number=200)
+def equation_glyphs(context: Dict):
+    font = font_manager.get(size=24)
+    atlas = glyph_renderer.atlas(font)
+    return lambda: atlas.render("12 × 7 = 84"), 1
+
+
+@benchmark("widget.button.hover", number=200)
+def button_hover(context: Dict):
+    button = GameButton("Play", 320, 240, font=context["game"].font)
+    inside, outside = button.rect.center, (0, 0)
+    state = {"pos": outside}
+    pygame.mouse.get_pos = lambda: state["pos"]
+
+    def operation():
+        state["pos"] = inside
+        button.check_mouse_hover()
+        state["pos"] = outside
+        button.check_mouse_hover()
+
+    return operation, 2
+
+
+class _StubWidget:
+    """Enough of a Gtk widget for the Translator to hook into"""
+
+    def add_events(self, mask):
+        pass
+
+    def set_events(self, mask):
+        pass
+
+    def set_can_focus(self, can_focus):
+        pass
+
+    def connect(self, signal, callback):
+        pass
+
+
+class _StubKeyEvent:
+    def __init__(self, keyval):
+        self.keyval = keyval
+
+
+class _StubMotionEvent:
+    is_hint = False
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def get_state(self):
+        return 0
+
+
+def _translator():
+    # Needs PyGObject, reported as skipped when it is not installed
+    from gi.repository import Gdk
+    import sugargame.event
+
+    return Gdk, sugargame.event.Translator(_StubWidget(), _StubWidget())
+
+
+@benchmark("event.translate.key", number=20)
+def translate_key(context: Dict):
+    Gdk, translator = _translator()
+    events = [
+        _StubKeyEvent(keyval)
+        for keyval in (Gdk.KEY_a, Gdk.KEY_5, Gdk.KEY_Return, Gdk.KEY_KP_Up)
+    ]
+
+    def operation():
+        for index in range(EVENT_BATCH):
+            event = events[index % len(events)]
+            translator._keydown_cb(None, event)
+            translator._keyup_cb(None, event)
+        pygame.event.clear()
+
+    return operation, 2 * EVENT_BATCH
+
+
+@benchmark("event.translate.mouse", number=20)
+def translate_mouse(context: Dict):
+    _, translator = _translator()
+    events = [_StubMotionEvent(x, x // 2) for x in range(EVENT_BATCH)]
+
+    def operation():
+        for event in events:
+            translator._mousemove_cb(None, event)
+        pygame.event.clear()
+
+    return operation, EVENT_BATCH
+
+
+@benchmark("frame.menu.full", number=50)
+def frame_menu_full(context: Dict):
+    game = context["game"]
+    game.scenes.switch("menu")
+
+    def operation():
+        game.renderer.invalidate()
+        game.render()
+
+    return operation, 1
+
+
+@benchmark("frame.menu.hover", number=200)
+def frame_menu_hover(context: Dict):
+    game = context["game"]
+    scene = game.scenes.switch("menu")
+    game.render()
+    button = scene.play_button
+
+    def operation():
+        button.dirty = True
+        game.render()
+
+    return operation, 1
@@ -0,0 +1,193 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pygame
+
+# A case takes the shared context and returns the operation to time, plus the
+# number of logical operations one call of it performs
+Case = Callable[[Dict], Tuple[Callable[[], None], int]]
+
+BENCHMARKS: Dict[str, Tuple[Case, int, int]] = {}
+
+
+def benchmark(name: str, number: int = 100, repeat: int = 7):
+    """Register a benchmark case
+
+    Args:
+        name (str): Unique, stable name used to compare runs.
+        number (int): Calls of the operation per measurement. Defaults to 100.
+        repeat (int): Number of measurements. Defaults to 7.
+    """
+
+    def register(case: Case) -> Case:
+        BENCHMARKS[name] = (case, number, repeat)
+        return case
+
+    return register
+
+
+def measure(
+    operation: Callable[[], None], number: int, repeat: int, ops_per_call: int = 1
+) -> Dict:
+    """Time an operation
+
+    Args:
+        operation (Callable[[], None]): The operation.
+        number (int): Calls per measurement.
+        repeat (int): Number of measurements.
+        ops_per_call (int): Logical operations per call. Defaults to 1.
+
+    Returns:
+        Dict: Seconds per logical operation (min, median, mean, stdev).
+    """
+
+    # Warm up once so lazy initialisation is not measured
+    operation()
+
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                operation()
+            samples.append((time.perf_counter() - start) / (number * ops_per_call))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return {
+        "number": number,
+        "repeat": repeat,
+        "ops_per_call": ops_per_call,
+        "min": min(samples),
+        "median": statistics.median(samples),
+        "mean": statistics.mean(samples),
+        "stdev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata(context: Dict) -> Dict:
+    """Describe the machine and build the benchmarks ran on"""
+
+    return {
+        "commit": _git_commit(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "sdl": ".".join(str(part) for part in pygame.get_sdl_version()),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "screen": list(context["screen"].get_size()),
+    }
+
+
+def run(context: Dict, names: Optional[List[str]] = None, scale: float = 1.0) -> Dict:
+    """Run registered benchmarks
+
+    Args:
+        context (Dict): Shared context handed to every case.
+        names (Optional[List[str]]): Only run benchmarks whose name contains\
+            one of these. All by default.
+        scale (float): Multiplier for the number of calls per measurement.
+
+    Returns:
+        Dict: Metadata and results keyed by benchmark name.
+    """
+
+    results = {}
+    for name, (case, number, repeat) in BENCHMARKS.items():
+        if names and not any(part in name for part in names):
+            continue
+
+        try:
+            operation, ops_per_call = case(context)
+        except ImportError as missing_dependency:
+            results[name] = {"skipped": str(missing_dependency)}
+            continue
+
+        results[name] = measure(
+            operation, max(1, int(number * scale)), repeat, ops_per_call
+        )
+
+    return {"metadata": metadata(context), "results": results}
+
+
+def compare(baseline: Dict, current: Dict, threshold: float = 0.1) -> List[Dict]:
+    """Compare median times of two runs
+
+    Args:
+        baseline (Dict): Earlier output of run.
+        current (Dict): Later output of run.
+        threshold (float): Relative slowdown counted as a regression.\
+            Defaults to 0.1 (10%).
+
+    Returns:
+        List[Dict]: One entry per benchmark present in both runs.
+    """
+
+    rows = []
+    for name, result in current["results"].items():
+        old = baseline["results"].get(name)
+        if not old or "median" not in old or "median" not in result:
+            continue
+
+        ratio = result["median"] / old["median"] if old["median"] else float("inf")
+        rows.append(
+            {
+                "name": name,
+                "baseline": old["median"],
+                "current": result["median"],
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold,
+            }
+        )
+    return rows
+
+
+def load(path: str) -> Dict:
+    with open(path) as results_file:
+        return json.load(results_file)
+
+
+def save(results: Dict, path: str) -> None:
+    with open(path, "w") as results_file:
+        json.dump(results, results_file, indent=2, sort_keys=True)
@@ -20,22 +20,51 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from gettext import gettext
+import json
+import os
 import random
 import time
-from typing import Optional, SupportsFloat, Tuple
+from typing import Callable, List, Optional, SupportsFloat, Tuple
 
 import pygame
-import gi
-from gi.repository import Gtk
 
-gi.require_version("Gtk", "3.0")
+try:
+    import gi
 
-from sugar3.activity.activity import Activity, get_activity_root
+    gi.require_version("Gtk", "3.0")
+    from gi.repository import Gtk
+    from sugar3.activity.activity import Activity, get_activity_root
+    from sugar3 import profile as sugar_profile
+except (ImportError, ValueError):
+    # Running outside Sugar, see core.headless
+    Gtk = None
+    Activity = None
+    sugar_profile = None
 
-from core.utils import logger
-from core.ui import GameButton, GAME_BACKGROUND_PATH, load_sprite, TextBox
-from core.ui.fonts import GameFont
+from core.utils import (
+    atomic_write,
+    FrameProfiler,
+    FrameScheduler,
+    logger,
+    NullProfiler,
+)
+from core.problems import AdaptiveDifficulty, ProblemGenerator, ProblemQueue
+from core.progress import ProgressStore
+from core.results_store import ResultsStore
+from core.scenes import MenuScene, QuestionScene, ResultsScene, SceneManager
+from core.ui import (
+    AssetRegistry,
+    choose_render_mode,
+    DEFAULT_ASSETS,
+    DirtyRenderer,
+    glyph_renderer,
+    ProfilerOverlay,
+    ROBOTO_FONT_PATH,
+    ScaledSpriteCache,
+    sprite_cache,
+    text_cache,
+)
+from core.ui.fonts import font_manager
 
 
 class Game:
@@ -44,17 +73,97 @@ class Game:
     SCREEN_WIDTH = 640
     SCREEN_HEIGHT = 480
 
-    def __init__(self, parent_activity: Activity) -> None:
+    TARGET_FPS = 30
+    IDLE_FPS = 4
+
+    # Kinds of questions the scenes ask, only these are prefetched
+    QUESTION_KINDS = ("shape",)
+
+    def __init__(
+        self,
+        parent_activity: Activity,
+        target_fps: Optional[float] = None,
+        idle_fps: Optional[float] = None,
+        headless: bool = False,
+        scheduler: Optional[FrameScheduler] = None,
+        profile: Optional[bool] = None,
+        profile_export: Optional[str] = None,
+        render_mode: Optional[str] = None,
+        problem_seed: Optional[int] = None,
+    ) -> None:
         """Create the game instance to play
 
         Args:
             parent_activity (Activity): Parent Sugar Activity.
+            target_fps (Optional[float]): Frame rate while something is\
+                happening on screen. Defaults to TARGET_FPS.
+            idle_fps (Optional[float]): Frame rate while nothing changes.\
+                Defaults to IDLE_FPS.
+            headless (bool): Run without pumping GTK events. Defaults to False.
+            scheduler (Optional[FrameScheduler]): Custom frame scheduler.\
+                Overrides target_fps and idle_fps.
+            profile (Optional[bool]): Time every frame phase and show an\
+                overlay, toggled with F3. Defaults to whether the\
+                BASICMATHS_PROFILE environment variable is set.
+            profile_export (Optional[str]): CSV or JSON file the profile is\
+                written to when the game stops. Defaults to the value of\
+                BASICMATHS_PROFILE if it is a file name.
+            render_mode (Optional[str]): "scaled" scales every asset to the\
+                screen, "logical" draws on a SCREEN_WIDTH x SCREEN_HEIGHT\
+                canvas scaled to the screen once per frame, "auto" picks the\
+                faster one at startup. Defaults to BASICMATHS_RENDER_MODE or\
+                "auto".
+            problem_seed (Optional[int]): Seed of the question generator,\
+                for replaying the same questions. Random by default.
         """
 
         self.parent_activity = parent_activity
-        self.username = ""
+        self.username = sugar_profile.get_nick_name() if sugar_profile else ""
         self.keys = (pygame.K_RETURN, pygame.K_ESCAPE)
 
+        self.headless = headless or Gtk is None
+        self.scheduler = scheduler or FrameScheduler(
+            target_fps=self.TARGET_FPS if target_fps is None else target_fps,
+            idle_fps=idle_fps or self.IDLE_FPS,
+        )
+        profile_env = os.environ.get("BASICMATHS_PROFILE", "")
+        if profile is None:
+            profile = bool(profile_env)
+        if profile_export is None and profile_env.lower().endswith((".csv", ".json")):
+            profile_export = profile_env
+        self.profiler = FrameProfiler() if profile else NullProfiler()
+        self.profile_export = profile_export
+        self.profiler_overlay = None
+
+        self.render_mode = render_mode or os.environ.get(
+            "BASICMATHS_RENDER_MODE", "auto"
+        )
+
+        self.frame = 0
+        self.frame_callbacks: List[Callable[["Game"], None]] = []
+        self.running = False
+
+        self.problems = ProblemGenerator(problem_seed)
+        self.difficulty = AdaptiveDifficulty()
+        self.progress = ProgressStore(
+            os.path.join(parent_activity.get_activity_root(), "data", "progress"),
+            parent_activity.get_id(),
+        )
+        self.problem_queues = {
+            kind: ProblemQueue(self.problems, kind) for kind in self.QUESTION_KINDS
+        }
+        # Local progress until the Journal provides its own in read_file
+        self.load_progress()
+        self.results = ResultsStore(
+            os.path.join(parent_activity.get_activity_root(), "data", "results.sqlite")
+        )
+        self.session: Optional[str] = None
+
+        self.scenes = SceneManager(self)
+        self.scenes.register("menu", MenuScene)
+        self.scenes.register("question", QuestionScene)
+        self.scenes.register("results", ResultsScene)
+
     def _scale_coordinates(
         self,
         x: SupportsFloat,
@@ -78,65 +187,291 @@ class Game:
         custom_scale_y = custom_scale_y or self.scale_x
         return (int(x * custom_scale_x), int(y * custom_scale_y))
 
-    def run(self) -> None:
-        """Run the game instance"""
+    def display_to_screen(self, pos: Tuple[int, int]) -> Tuple[int, int]:
+        """Map a position on the display to the surface the game draws on
+
+        Args:
+            pos (Tuple[int, int]): Position on the display, e.g. of the mouse.
+
+        Returns:
+            Tuple[int, int]: Position on self.screen.
+        """
+
+        if self.screen is self.display:
+            return pos
+        return (
+            int(pos[0] * self.screen.get_width() / self.display.get_width()),
+            int(pos[1] * self.screen.get_height() / self.display.get_height()),
+        )
+
+    def world_to_display(self, x: SupportsFloat, y: SupportsFloat) -> Tuple[int, int]:
+        """Return where a point in world coordinates ends up on the display
+
+        Args:
+            x (SupportsFloat): X coordinate of point.
+            y (SupportsFloat): Y coordinate of point.
+
+        Returns:
+            Tuple[int, int]: Position on the display.
+        """
+
+        x, y = self._scale_coordinates(x, y)
+        if self.screen is self.display:
+            return (x, y)
+        return (
+            int(x * self.display.get_width() / self.screen.get_width()),
+            int(y * self.display.get_height() / self.screen.get_height()),
+        )
+
+    def _auto_render_mode(self, logical_size: Tuple[int, int]) -> str:
+        """Return the faster render mode for the display, measured once per\
+        display size and remembered in the activity's data directory"""
+
+        cache_path = os.path.join(
+            self.parent_activity.get_activity_root(), "data", "render_mode.json"
+        )
+        display_size = "%dx%d" % self.display.get_size()
+        try:
+            with open(cache_path) as cache_file:
+                modes = json.load(cache_file)
+        except (OSError, ValueError):
+            modes = {}
+        if not isinstance(modes, dict):
+            modes = {}
+        if modes.get(display_size) in ("scaled", "logical"):
+            return modes[display_size]
+
+        modes[display_size] = choose_render_mode(
+            self.display,
+            logical_size,
+            [
+                pygame.image.load(asset.path)
+                for asset in DEFAULT_ASSETS
+                if asset.kind == "sprite"
+            ],
+            ROBOTO_FONT_PATH,
+        )
+        try:
+            with atomic_write(cache_path) as cache_file:
+                cache_file.write(json.dumps(modes).encode())
+        except OSError:
+            logger.warning(f"Unable to remember the render mode in {cache_path}.")
+        return modes[display_size]
+
+    def setup(self) -> None:
+        """Load the screen, shared assets and the first scene"""
 
-        self.screen = pygame.display.get_surface()
-        if not self.screen:
+        self.display = pygame.display.get_surface()
+        if not self.display:
             logger.warning("Could not load surface. Creating screen using set_mode.")
-            self.screen = pygame.display.set_mode(
+            self.display = pygame.display.set_mode(
                 (pygame.display.Info().current_w, pygame.display.Info().current_h)
             )
 
+        logical_size = (self.SCREEN_WIDTH, self.SCREEN_HEIGHT)
+        if self.render_mode == "auto":
+            self.render_mode = self._auto_render_mode(logical_size)
+        logger.info(f"Using {self.render_mode} render mode")
+
+        if self.render_mode == "logical":
+            # Everything is drawn at world size and scaled once per frame
+            self.screen = pygame.Surface(logical_size).convert()
+        else:
+            self.screen = self.display
+
         self.scale_x = self.screen.get_width() / self.SCREEN_WIDTH
         self.scale_y = self.screen.get_height() / self.SCREEN_HEIGHT
 
-        self.background = load_sprite(
-            GAME_BACKGROUND_PATH,
-            scale_x=self.scale_x,
-            scale_y=self.scale_y,
+        font_manager.set_scale(self.scale_x)
+        glyph_renderer.clear()
+        self.assets = AssetRegistry(
+            self.scale_x,
+            self.scale_y,
+            self.screen.get_size(),
+            ScaledSpriteCache(
+                os.path.join(self.parent_activity.get_activity_root(), "data", "sprites")
+            ),
         )
-        self.screen.blit(self.background, (0, 0))
-
-        self.font = pygame.font.Font(
-            "./fonts/Roboto.ttf", self._scale_coordinates(12, 0)[0]
+        self.background = self.assets.get("background")
+        self.renderer = DirtyRenderer(
+            self.screen,
+            self.background,
+            self.display if self.screen is not self.display else None,
         )
+        self.font = self.assets.get("font")
+
+        self.session = self.results.start_session(self.username)
+        self.scenes.switch("menu")
+
+        if self.profiler.enabled:
+            self.profiler_overlay = ProfilerOverlay(self.profiler, self.font)
+            self.renderer.add_overlay(self.profiler_overlay)
+
+    def run(self) -> bool:
+        """Run the game instance
+
+        Returns:
+            bool: Always False, so GLib does not schedule the game again.
+        """
+
+        self.setup()
         self.running = True
-        self.main_menu()
 
-    def main_menu(self) -> None:
-        self.play_button = GameButton(
-            gettext("Play"), *self._scale_coordinates(475, 180), font=self.font
-        )
-        self.quit_button = GameButton(
-            gettext("Quit"), *self._scale_coordinates(475, 360), font=self.font
-        )
-        self.buttons = [self.play_button, self.quit_button]
+        profiler = self.profiler
+        while self.running:
+            profiler.begin_frame()
+            updates = self.scheduler.begin_frame()
+            for callback in self.frame_callbacks:
+                callback(self)
+            profiler.mark("callbacks")
 
-        self.title = TextBox(
-            gettext("Select the correct shape"),
-            *self._scale_coordinates(475, 540),
-            font=self.font
-        )
+            if not self.headless:
+                while Gtk.events_pending():
+                    Gtk.main_iteration()
+            profiler.mark("gtk")
+
+            self.handle_events()
+            profiler.mark("events")
+
+            for _ in range(updates):
+                self.update(self.scheduler.step)
+            profiler.mark("update")
+
+            changed = self.render()
+            profiler.mark("render")
+
+            self.assets.finalize_pending()
+            self.results.deliver_pending()
+            if not changed:
+                # Use the spare time of a quiet frame to get scenes and
+                # questions ready, one batch of work per frame
+                self.scenes.preload_step() or self.prefetch_problems()
+            profiler.mark("preload")
+
+            profiler.end_frame()
+            self.scheduler.end_frame(changed)
+            self.frame += 1
+
+        self.assets.shutdown()
+        self.progress.flush()
+        self.results.end_session(self.session)
+        self.results.close()
+        logger.debug(f"Sprite cache: {sprite_cache.stats()}")
+        logger.debug(f"Text cache: {text_cache.stats()}")
+        if self.profiler.enabled and self.profile_export:
+            self.profiler.export(self.profile_export)
+            logger.info(f"Wrote frame profile to {self.profile_export}")
+
+        return False
+
+    def prefetch_problems(self) -> bool:
+        """Top up a question queue that ran low
+
+        Returns:
+            bool: Whether questions were generated.
+        """
+
+        return any(queue.refill() for queue in self.problem_queues.values())
+
+    def record_answer(self, problem, correct: bool, seconds: float) -> None:
+        """Update the learner model with an answer and draw the next\
+        questions of that kind from the level it picks
+
+        Args:
+            problem (Union[ArithmeticProblem, ShapeProblem]): The question.
+            correct (bool): Whether the answer was right.
+            seconds (float): Time taken to answer.
+        """
+
+        self.difficulty.record(problem, correct, seconds)
+        self.progress.record(problem, correct, seconds)
+        self.results.record(self.session, problem, correct, seconds)
+        kind = problem.kind_name
+        self.problem_queues[kind].level = self.difficulty.level(kind)
+
+    def load_progress(self, file_path: Optional[str] = None) -> None:
+        """Resume the learner's progress
+
+        Args:
+            file_path (Optional[str]): File from the Journal. None to resume\
+                from the local log only.
+        """
 
-        self.screen.blit(self.play_button, self.play_button.rect)
-        self.screen.blit(self.quit_button, self.quit_button.rect)
-        self.screen.blit(self.title, self.title.rect)
+        self.difficulty = self.progress.resume(file_path)
+        for kind, queue in self.problem_queues.items():
+            queue.level = self.difficulty.level(kind)
 
-        while Gtk.events_pending():
-            Gtk.main_iteration()
+    def save_progress(self, file_path: str) -> None:
+        """Write the learner's progress for the Journal
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
+        Args:
+            file_path (str): File the Journal stores.
+        """
+
+        self.progress.save(file_path, self.difficulty)
+
+    def handle_events(self) -> None:
+        """Drain the pygame event queue"""
+
+        events = pygame.event.get()
+        if events:
+            self.scheduler.wake()
+
+        # Only the last pointer position of a frame matters for hover state
+        pointer = None
+        for event in events:
+            if self.screen is not self.display and hasattr(event, "pos"):
+                event = pygame.event.Event(
+                    event.type, event.dict, pos=self.display_to_screen(event.pos)
+                )
+
+            if event.type == pygame.MOUSEMOTION:
+                pointer = event.pos
+
+            elif event.type == pygame.QUIT:
                 self.stop()
 
-            elif event.type == pygame.MOUSEMOTION:
-                for btn in self.buttons:
-                    btn.check_mouse_hover()
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.VIDEORESIZE):
+                self.renderer.invalidate()
+
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.toggle_profiler_overlay()
+
+            else:
+                self.scenes.handle_event(event)
+
+        if pointer is not None:
+            self.scenes.hover(pointer)
+
+    def update(self, dt: float) -> None:
+        """Advance game logic by one fixed step
+
+        Args:
+            dt (float): Length of the step in seconds.
+        """
+
+        self.scenes.update(dt)
+        if self.profiler_overlay in self.renderer.overlays:
+            self.profiler_overlay.refresh()
+
+    def toggle_profiler_overlay(self) -> None:
+        """Show or hide the profiler overlay, if profiling is enabled"""
+
+        if not self.profiler_overlay:
+            return
+        if self.profiler_overlay in self.renderer.overlays:
+            self.renderer.remove_overlay(self.profiler_overlay)
+        else:
+            self.renderer.add_overlay(self.profiler_overlay)
+
+    def render(self) -> bool:
+        """Redraw whatever changed since the last frame
+
+        Returns:
+            bool: Whether anything was drawn.
+        """
 
-            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                if self.quit_button.check_mouse_hover():
-                    self.stop()
+        return bool(self.renderer.render())
 
     def stop(self) -> None:
         """Stop the running instance"""
@@ -0,0 +1,267 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Run the game without Sugar, GTK or a display.
+
+Uses the SDL dummy video driver and a stub parent activity, and drives the
+game through scripted inputs as fast as possible. Useful for profiling and
+load testing on machines without Sugar::
+
+    python -m core.headless --frames 600 --script inputs.json --profile out.csv
+
+A script is a JSON list of input events, each with the frame it is sent on
+and positions in world coordinates (640x480)::
+
+    [{"frame": 10, "type": "motion", "pos": [480, 185]},
+     {"frame": 12, "type": "click", "pos": [480, 185]},
+     {"frame": 20, "type": "key", "key": "RETURN"}]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pygame
+
+from core.game import Game
+from core.utils import FrameScheduler, logger
+
+BUNDLE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class HeadlessActivity:
+    """Stand-in for the Sugar Activity the game normally runs in"""
+
+    def __init__(self, activity_root: Optional[str] = None) -> None:
+        """Create a stub activity
+
+        Args:
+            activity_root (Optional[str]): Directory used as the activity\
+                root. A new temporary directory by default.
+        """
+
+        self.activity_root = activity_root or tempfile.mkdtemp(prefix="basicmaths-")
+        for name in ("data", "instance", "tmp"):
+            os.makedirs(os.path.join(self.activity_root, name), exist_ok=True)
+        self.metadata = {}
+
+    def get_activity_root(self) -> str:
+        return self.activity_root
+
+    def get_id(self) -> str:
+        return "headless"
+
+    def close(self) -> None:
+        pass
+
+
+class SimulatedClock:
+    """Clock that only moves when told to, so headless runs are deterministic"""
+
+    def __init__(self, step: float) -> None:
+        """Create a clock starting at zero
+
+        Args:
+            step (float): Seconds the clock advances on every tick.
+        """
+
+        self.step = step
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def tick(self, game: Game) -> None:
+        """Frame callback advancing the clock by one step"""
+
+        self.now += self.step
+
+
+class ScriptedInput:
+    """Frame callback posting scripted input events to the pygame queue"""
+
+    def __init__(self, script: Iterable[Dict], frames: Optional[int] = None) -> None:
+        """Create scripted input
+
+        Args:
+            script (Iterable[Dict]): Input events, see the module docstring.
+            frames (Optional[int]): Quit after this many frames. By default\
+                the game quits on the frame after the last scripted event.
+        """
+
+        self.script = sorted(script, key=lambda item: item["frame"])
+        self.frames = frames
+        if frames is None:
+            self.frames = self.script[-1]["frame"] + 1 if self.script else 1
+
+        self.pos = (0, 0)
+        self._next = 0
+
+    def get_pos(self) -> Tuple[int, int]:
+        """Replacement for pygame.mouse.get_pos, which the dummy driver never moves"""
+
+        return self.pos
+
+    def _to_events(self, game: Game, item: Dict) -> List[pygame.event.Event]:
+        """Translate a script item into pygame events"""
+
+        kind = item["type"]
+        if kind == "quit":
+            return [pygame.event.Event(pygame.QUIT)]
+
+        if kind == "key":
+            key = getattr(pygame, "K_" + item["key"])
+            return [
+                pygame.event.Event(pygame.KEYDOWN, key=key, unicode="", mod=0),
+                pygame.event.Event(pygame.KEYUP, key=key, unicode="", mod=0),
+            ]
+
+        pos = game.world_to_display(*item["pos"])
+        rel = (pos[0] - self.pos[0], pos[1] - self.pos[1])
+        self.pos = pos
+        motion = pygame.event.Event(
+            pygame.MOUSEMOTION, pos=pos, rel=rel, buttons=(0, 0, 0)
+        )
+        if kind == "motion":
+            return [motion]
+
+        if kind == "click":
+            button = item.get("button", 1)
+            return [
+                motion,
+                pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=button, pos=pos),
+                pygame.event.Event(pygame.MOUSEBUTTONUP, button=button, pos=pos),
+            ]
+
+        raise ValueError(f"Unknown scripted input type {kind}")
+
+    def __call__(self, game: Game) -> None:
+        while self._next < len(self.script) and (
+            self.script[self._next]["frame"] <= game.frame
+        ):
+            for event in self._to_events(game, self.script[self._next]):
+                pygame.event.post(event)
+            self._next += 1
+
+        if game.frame >= self.frames:
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+
+def init_display(size: Tuple[int, int] = (1200, 900)) -> pygame.Surface:
+    """Open a screen on the SDL dummy video driver
+
+    Args:
+        size (Tuple[int, int]): Screen size in pixels. Defaults to the XO's\
+            1200x900.
+
+    Returns:
+        Surface: The display surface.
+    """
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.display.init()
+    pygame.font.init()
+    return pygame.display.set_mode(size)
+
+
+def run_headless(
+    script: Iterable[Dict] = (),
+    frames: Optional[int] = None,
+    size: Tuple[int, int] = (1200, 900),
+    simulated_fps: float = 30,
+    activity_root: Optional[str] = None,
+    profile_export: Optional[str] = None,
+) -> Game:
+    """Run the game headless until the script ends
+
+    Expects the working directory to be the bundle root, like Sugar does.
+
+    Args:
+        script (Iterable[Dict]): Input events, see the module docstring.
+        frames (Optional[int]): Number of frames to run. Defaults to the\
+            frame after the last scripted event.
+        size (Tuple[int, int]): Screen size in pixels. Defaults to the XO's\
+            1200x900.
+        simulated_fps (float): Frame rate the game logic believes it runs\
+            at. Frames themselves are not throttled. Defaults to 30.
+        activity_root (Optional[str]): Activity root directory. A new\
+            temporary directory by default.
+        profile_export (Optional[str]): Profile every frame and write the\
+            result to this CSV or JSON file.
+
+    Returns:
+        Game: The game instance after it stopped.
+    """
+
+    init_display(size)
+
+    clock = SimulatedClock(1.0 / simulated_fps)
+    scripted_input = ScriptedInput(script, frames)
+    pygame.mouse.get_pos = scripted_input.get_pos
+
+    game = Game(
+        HeadlessActivity(activity_root),
+        headless=True,
+        scheduler=FrameScheduler(target_fps=0, update_hz=simulated_fps, clock=clock),
+        profile=bool(profile_export) or None,
+        profile_export=profile_export,
+    )
+    game.frame_callbacks.extend([clock.tick, scripted_input])
+    game.run()
+    return game
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, help="number of frames to run")
+    parser.add_argument("--script", help="JSON file with scripted input events")
+    parser.add_argument(
+        "--size", default="1200x900", help="screen size, defaults to 1200x900"
+    )
+    parser.add_argument(
+        "--fps",
+        type=float,
+        default=30,
+        help="frame rate simulated for game logic, defaults to 30",
+    )
+    parser.add_argument("--profile", help="CSV or JSON file to write a frame profile to")
+    args = parser.parse_args(argv)
+
+    script = []
+    if args.script:
+        with open(args.script) as script_file:
+            script = json.load(script_file)
+    profile = os.path.abspath(args.profile) if args.profile else None
+
+    os.chdir(BUNDLE_ROOT)
+    width, height = (int(value) for value in args.size.lower().split("x"))
+    game = run_headless(
+        script, args.frames, (width, height), args.fps, profile_export=profile
+    )
+    logger.info(f"Headless run finished after {game.frame} frames")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+from .generator import (
+    ArithmeticProblem,
+    DIFFICULTY_LEVELS,
+    Difficulty,
+    difficulty,
+    OPERATORS,
+    ProblemGenerator,
+    ShapeProblem,
+)
+from .prefetch import ProblemQueue
+from .adaptive import AdaptiveDifficulty, SkillStats
+from .bank import build_bank, QuestionBank
@@ -0,0 +1,205 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from dataclasses import asdict, dataclass
+import math
+from typing import Dict, Optional
+
+from core.problems.generator import DIFFICULTY_LEVELS
+
+
+@dataclass
+class SkillStats:
+    """Running statistics of one skill, updated in constant time per answer"""
+
+    attempts: int = 0
+    correct: int = 0
+    # Exponentially weighted, so recent answers count more
+    accuracy: float = 0.0
+    # Response time mean and sum of squared deviations (Welford)
+    time_mean: float = 0.0
+    time_m2: float = 0.0
+    rating: float = 1000.0
+
+    # Weight of the latest answer in the accuracy
+    ACCURACY_WEIGHT = 0.1
+
+    @property
+    def time_variance(self) -> float:
+        """Sample variance of the response times"""
+
+        return self.time_m2 / (self.attempts - 1) if self.attempts > 1 else 0.0
+
+    def record(self, correct: bool, seconds: float, expected: float, k: float) -> None:
+        """Add an answer
+
+        Args:
+            correct (bool): Whether the answer was right.
+            seconds (float): Time taken to answer.
+            expected (float): Chance of a right answer the rating predicted.
+            k (float): Largest possible rating change.
+        """
+
+        self.attempts += 1
+        self.correct += bool(correct)
+
+        if self.attempts == 1:
+            self.accuracy = float(correct)
+        else:
+            self.accuracy += self.ACCURACY_WEIGHT * (correct - self.accuracy)
+
+        delta = seconds - self.time_mean
+        self.time_mean += delta / self.attempts
+        self.time_m2 += delta * (seconds - self.time_mean)
+
+        self.rating += k * (correct - expected)
+
+
+class AdaptiveDifficulty:
+    """Learner model choosing the difficulty level of the next questions.
+
+    Every skill, a kind of question and for arithmetic also each operator,
+    has an Elo-style rating played against the rating of the level a
+    question was drawn from. The next level of a kind is the one the
+    learner is expected to answer right TARGET_SUCCESS of the time, reached
+    one level at a time as answers come in.
+    """
+
+    # Rating of the questions of level 1, and the step between levels
+    BASE_RATING = 1000.0
+    LEVEL_STEP = 150.0
+    TARGET_SUCCESS = 0.75
+    # Answers at a level before it may change again, so it does not flap
+    MIN_ANSWERS = 3
+
+    def __init__(self) -> None:
+        self.skills: Dict[str, SkillStats] = {}
+        self._levels: Dict[str, int] = {}
+        self._answers_at_level: Dict[str, int] = {}
+
+    @classmethod
+    def level_rating(cls, level: int) -> float:
+        """Rating of the questions of a level"""
+
+        return cls.BASE_RATING + (level - 1) * cls.LEVEL_STEP
+
+    @staticmethod
+    def expected(rating: float, opponent: float) -> float:
+        """Chance of a right answer for a rating against a question rating"""
+
+        return 1.0 / (1.0 + math.pow(10.0, (opponent - rating) / 400.0))
+
+    @staticmethod
+    def k_factor(attempts: int) -> float:
+        """Rating change per answer, large while little is known"""
+
+        return 40.0 if attempts < 20 else 20.0
+
+    def skill(self, name: str) -> SkillStats:
+        """Return the statistics of a skill, creating them if needed"""
+
+        stats = self.skills.get(name)
+        if stats is None:
+            stats = self.skills[name] = SkillStats(rating=self.BASE_RATING)
+        return stats
+
+    def record(self, problem, correct: bool, seconds: float) -> None:
+        """Update the learner model with an answer
+
+        Args:
+            problem (Union[ArithmeticProblem, ShapeProblem]): The question.
+            correct (bool): Whether the answer was right.
+            seconds (float): Time taken to answer.
+        """
+
+        opponent = self.level_rating(problem.level)
+        kind = problem.kind_name
+        for name in {kind, problem.skill}:
+            stats = self.skill(name)
+            stats.record(
+                correct,
+                seconds,
+                self.expected(stats.rating, opponent),
+                self.k_factor(stats.attempts),
+            )
+        self._answers_at_level[kind] = self._answers_at_level.get(kind, 0) + 1
+        self._update_level(kind)
+
+    def _update_level(self, kind: str) -> None:
+        """Step the level of a kind one level towards the best match of its\
+        rating, once enough answers were given at the current level"""
+
+        if self._answers_at_level[kind] < self.MIN_ANSWERS:
+            return
+
+        current = self._levels.get(kind, 1)
+        rating = self.skill(kind).rating
+        best = min(
+            (level.level for level in DIFFICULTY_LEVELS),
+            key=lambda level: abs(
+                self.expected(rating, self.level_rating(level)) - self.TARGET_SUCCESS
+            ),
+        )
+        if best != current:
+            self._levels[kind] = current + (1 if best > current else -1)
+            self._answers_at_level[kind] = 0
+
+    def level(self, kind: str) -> int:
+        """Return the difficulty level to draw the next questions of a kind from
+
+        Args:
+            kind (str): "arithmetic" or "shape".
+
+        Returns:
+            int: Level number.
+        """
+
+        return self._levels.get(kind, 1)
+
+    def to_dict(self) -> Dict:
+        """Return the model as plain data, e.g. for saving it"""
+
+        return {
+            "skills": {name: asdict(stats) for name, stats in self.skills.items()},
+            "levels": dict(self._levels),
+            "answers_at_level": dict(self._answers_at_level),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> "AdaptiveDifficulty":
+        """Restore a model saved with to_dict
+
+        Args:
+            data (Optional[Dict]): Saved model. None for a new learner.
+
+        Returns:
+            AdaptiveDifficulty: The model.
+        """
+
+        model = cls()
+        if data:
+            model.skills = {
+                name: SkillStats(**stats) for name, stats in data["skills"].items()
+            }
+            model._levels = dict(data.get("levels", {}))
+            model._answers_at_level = dict(data.get("answers_at_level", {}))
+        return model
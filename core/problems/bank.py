@@ -0,0 +1,479 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import argparse
+from collections import deque
+import csv
+import json
+import mmap
+import struct
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from core.problems.generator import (
+    ADD,
+    ArithmeticProblem,
+    difficulty,
+    DIVIDE,
+    MULTIPLY,
+    OPERATORS,
+    ProblemGenerator,
+    ShapeProblem,
+    SUBTRACT,
+)
+from core.ui.shapes import SHAPE_COLORS, SHAPE_KINDS
+from core.utils import atomic_write, logger
+
+# magic, version, record count, group count, offsets of the groups and records
+HEADER = struct.Struct("<4sHxxIIII")
+MAGIC = b"BMQB"
+VERSION = 1
+
+# Most answer options a question can have
+MAX_OPTIONS = 5
+# Largest values of the record fields given in the sources
+MAX_LEVEL = 255
+MAX_TOPICS = 1 << 16
+INT_MIN, INT_MAX = -(1 << 31), (1 << 31) - 1
+
+# type, level, operator, option count, answer index, topic, left, right,
+# answer, options, option colors, option rotations
+RECORD = struct.Struct(f"<BBBBBxHiii{MAX_OPTIONS}i{MAX_OPTIONS}B{MAX_OPTIONS}H")
+ARITHMETIC, SHAPE = 0, 1
+KINDS = ("arithmetic", "shape")
+
+# type, level, topic, first record, record count
+GROUP = struct.Struct("<BBHII")
+
+Problem = Union[ArithmeticProblem, ShapeProblem]
+
+
+def _pack_strings(strings: Sequence[str]) -> bytes:
+    data = struct.pack("<H", len(strings))
+    for string in strings:
+        encoded = string.encode()
+        data += struct.pack("<H", len(encoded)) + encoded
+    return data
+
+
+def _unpack_strings(buffer, offset: int) -> Tuple[List[str], int]:
+    (count,) = struct.unpack_from("<H", buffer, offset)
+    offset += 2
+    strings = []
+    for _ in range(count):
+        (length,) = struct.unpack_from("<H", buffer, offset)
+        strings.append(bytes(buffer[offset + 2 : offset + 2 + length]).decode())
+        offset += 2 + length
+    return strings, offset
+
+
+def _read_source(path: str) -> List[Dict]:
+    """Read the questions of a JSON or CSV source set"""
+
+    with open(path, newline="", encoding="utf-8") as source:
+        if path.lower().endswith(".csv"):
+            rows = []
+            for row in csv.DictReader(source):
+                # List columns are separated by semicolons
+                rows.append(
+                    {
+                        key: value.split(";")
+                        if key in ("options", "colors", "rotations")
+                        else value
+                        for key, value in row.items()
+                        if value not in (None, "")
+                    }
+                )
+            return rows
+        data = json.load(source)
+    return data["questions"] if isinstance(data, dict) else data
+
+
+def _arithmetic_answer(left: int, operator: str, right: int) -> int:
+    if operator == ADD:
+        return left + right
+    if operator == SUBTRACT:
+        return left - right
+    if operator == MULTIPLY:
+        return left * right
+    # Like generated questions, divisions come out even
+    if left % right:
+        raise ValueError(f"{left} {DIVIDE} {right} has no whole answer")
+    return left // right
+
+
+def _check_range(name: str, value: int, low: int, high: int) -> int:
+    """Return value if it fits its record field, raise ValueError otherwise"""
+
+    if not low <= value <= high:
+        raise ValueError(f"{name} {value} is not between {low} and {high}")
+    return value
+
+
+def _compile(
+    question: Dict, topics: List[str], options_generator: ProblemGenerator
+) -> Tuple:
+    """Turn a source question into the fields of its record"""
+
+    topic = question.get("topic", "")
+    if topic not in topics:
+        topics.append(topic)
+    _check_range("Topic number", topics.index(topic), 0, MAX_TOPICS - 1)
+    level = _check_range("Level", int(question.get("level", 1)), 1, MAX_LEVEL)
+    empty = (0,) * MAX_OPTIONS
+
+    if "kind" in question:
+        kind = question["kind"]
+        options = list(question.get("options") or [kind])
+        if kind not in options:
+            raise ValueError(f"Shape question options {options} miss {kind}")
+        colors = list(question.get("colors") or ["red"] * len(options))
+        rotations = [
+            int(rotation) % 360 for rotation in question.get("rotations") or []
+        ]
+        rotations += [0] * (len(options) - len(rotations))
+        return (
+            SHAPE,
+            level,
+            0,
+            len(options),
+            options.index(kind),
+            topics.index(topic),
+            0,
+            0,
+            0,
+            *(SHAPE_KINDS.index(option) for option in options),
+            *empty[len(options) :],
+            *(tuple(SHAPE_COLORS).index(color) for color in colors),
+            *empty[len(colors) :],
+            *rotations,
+            *empty[len(rotations) :],
+        )
+
+    left, operator, right = int(question["left"]), question["operator"], int(
+        question["right"]
+    )
+    operator = {"*": "×", "x": "×", "/": "÷"}.get(operator, operator)
+    if operator not in OPERATORS:
+        raise ValueError(f"Unknown operator {operator!r}")
+    if operator == DIVIDE and right == 0:
+        raise ValueError(f"Division of {left} by zero")
+    if "answer" in question:
+        answer = int(question["answer"])
+    else:
+        answer = _arithmetic_answer(left, operator, right)
+    if question.get("options"):
+        options = [int(option) for option in question["options"]]
+        if answer not in options:
+            raise ValueError(f"Options {options} miss the answer {answer}")
+    else:
+        row, _ = options_generator.answer_options(
+            np.array([answer]), difficulty(level).options
+        )
+        options = row[0].tolist()
+    # The answer is one of the options
+    for value in (left, right, *options):
+        _check_range("Number", value, INT_MIN, INT_MAX)
+    return (
+        ARITHMETIC,
+        level,
+        OPERATORS.index(operator),
+        len(options),
+        options.index(answer),
+        topics.index(topic),
+        left,
+        right,
+        answer,
+        *options,
+        *empty[len(options) :],
+        *empty,
+        *empty,
+    )
+
+
+def build_bank(sources: Iterable[str], output_path: str) -> Dict[str, int]:
+    """Compile JSON or CSV question sets into a question bank file
+
+    JSON sources hold a list of questions, or an object with a "questions"
+    list. CSV sources have one question per row with the same keys as
+    columns, list values separated by semicolons. Arithmetic questions have
+    left, operator and right, and optionally answer and options, which are
+    generated when missing. Shape questions have kind, options and
+    optionally colors and rotations. Both have an optional topic and level.
+
+    Args:
+        sources (Iterable[str]): Paths of the source sets.
+        output_path (str): Path of the question bank.
+
+    Returns:
+        Dict[str, int]: Number of questions, topics and groups written.
+    """
+
+    topics: List[str] = []
+    records = []
+    # Fixed seed, so rebuilding a bank gives the same options
+    options_generator = ProblemGenerator(0)
+    for source in sources:
+        for number, question in enumerate(_read_source(source), 1):
+            try:
+                fields = _compile(question, topics, options_generator)
+            except (KeyError, ValueError) as invalid_question:
+                raise ValueError(
+                    f"{source}: question {number} is invalid: {invalid_question!r}"
+                ) from invalid_question
+            if fields[3] > MAX_OPTIONS:
+                raise ValueError(
+                    f"{source}: question {number} has more than {MAX_OPTIONS} options"
+                )
+            records.append(fields)
+
+    # Questions of a group are stored next to each other
+    records.sort(key=lambda fields: (fields[0], fields[5], fields[1]))
+    groups = []
+    for index, fields in enumerate(records):
+        key = (fields[0], fields[1], fields[5])
+        if groups and tuple(groups[-1][:3]) == key:
+            groups[-1][4] += 1
+        else:
+            groups.append([*key, index, 1])
+
+    strings = _pack_strings(topics)
+    groups_offset = HEADER.size + len(strings)
+    records_offset = groups_offset + len(groups) * GROUP.size
+
+    with atomic_write(output_path) as bank_file:
+        bank_file.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                len(records),
+                len(groups),
+                groups_offset,
+                records_offset,
+            )
+        )
+        bank_file.write(strings)
+        for group in groups:
+            bank_file.write(GROUP.pack(*group))
+        for fields in records:
+            bank_file.write(RECORD.pack(*fields))
+
+    return {"questions": len(records), "topics": len(topics), "groups": len(groups)}
+
+
+class QuestionBank:
+    """Curated questions read from a memory-mapped question bank file.
+
+    Opening a bank only reads its header, topics and group index; a question
+    is unpacked from its fixed-width record when it is asked for. A bank can
+    stand in for a ProblemGenerator in a ProblemQueue.
+    """
+
+    def __init__(self, path: str, seed: Optional[int] = None) -> None:
+        """Open a question bank
+
+        Args:
+            path (str): Path of the bank file.
+            seed (Optional[int]): Seed for picking questions in batch.\
+                Random by default.
+
+        Raises:
+            ValueError: The file is not a question bank of this version.
+        """
+
+        self.path = path
+        self.rng = np.random.default_rng(seed)
+        # Positions of the latest questions picked in batch
+        self._recent = deque(maxlen=ProblemGenerator.HISTORY)
+        with open(path, "rb") as bank_file:
+            self._map = mmap.mmap(bank_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, count, group_count, groups_offset, records_offset = (
+                HEADER.unpack_from(self._map)
+            )
+            if (
+                magic != MAGIC
+                or version != VERSION
+                or len(self._map) != records_offset + count * RECORD.size
+            ):
+                raise ValueError(f"{path} is not a question bank of version {VERSION}")
+
+            self.topics, _ = _unpack_strings(self._map, HEADER.size)
+            self._count = count
+            self._records_offset = records_offset
+            # (kind, level, topic) -> (first record, record count)
+            self._groups: Dict[Tuple[str, int, str], Tuple[int, int]] = {}
+            for index in range(group_count):
+                kind, level, topic, first, size = GROUP.unpack_from(
+                    self._map, groups_offset + index * GROUP.size
+                )
+                self._groups[(KINDS[kind], level, self.topics[topic])] = (first, size)
+        except (struct.error, IndexError):
+            self._map.close()
+            raise ValueError(f"{path} is not a valid question bank")
+        except ValueError:
+            self._map.close()
+            raise
+
+        logger.debug(f"Opened question bank {path} with {count} questions")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self) -> "QuestionBank":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __getitem__(self, index: int) -> Problem:
+        """Unpack a single question
+
+        Args:
+            index (int): Position of the question in the bank.
+
+        Returns:
+            Union[ArithmeticProblem, ShapeProblem]: The question.
+        """
+
+        if not 0 <= index < self._count:
+            raise IndexError(f"Question {index} is not in the bank")
+        fields = RECORD.unpack_from(
+            self._map, self._records_offset + index * RECORD.size
+        )
+        kind, level, operator, count, answer_index = fields[:5]
+        options = fields[9 : 9 + count]
+
+        if kind == SHAPE:
+            colors = tuple(SHAPE_COLORS)
+            color_fields = fields[9 + MAX_OPTIONS : 9 + MAX_OPTIONS + count]
+            rotation_fields = fields[9 + 2 * MAX_OPTIONS : 9 + 2 * MAX_OPTIONS + count]
+            return ShapeProblem(
+                SHAPE_KINDS[options[answer_index]],
+                tuple(SHAPE_KINDS[option] for option in options),
+                tuple(colors[color] for color in color_fields),
+                tuple(rotation_fields),
+                answer_index,
+                level,
+            )
+
+        left, right, answer = fields[6:9]
+        return ArithmeticProblem(
+            left, OPERATORS[operator], right, answer, options, answer_index, level
+        )
+
+    def groups(self) -> Dict[Tuple[str, int, str], int]:
+        """Return the number of questions per kind, level and topic"""
+
+        return {key: size for key, (_, size) in self._groups.items()}
+
+    def select(
+        self,
+        kind: Optional[str] = None,
+        level: Optional[int] = None,
+        topic: Optional[str] = None,
+    ) -> List[range]:
+        """Return the positions of matching questions
+
+        Args:
+            kind (Optional[str]): "arithmetic" or "shape". Any by default.
+            level (Optional[int]): Difficulty level. Any by default.
+            topic (Optional[str]): Topic. Any by default.
+
+        Returns:
+            List[range]: Ranges of question positions.
+        """
+
+        return [
+            range(first, first + size)
+            for (group_kind, group_level, group_topic), (
+                first,
+                size,
+            ) in self._groups.items()
+            if kind in (None, group_kind)
+            and level in (None, group_level)
+            and topic in (None, group_topic)
+        ]
+
+    def batch(
+        self, kind: str, count: int, level: int = 1, topic: Optional[str] = None
+    ) -> List[Problem]:
+        """Pick distinct random questions, from the nearest level that has\
+        any, preferring ones not picked recently
+
+        Args:
+            kind (str): "arithmetic" or "shape".
+            count (int): Number of questions.
+            level (int): Difficulty level. Defaults to 1.
+            topic (Optional[str]): Only questions of this topic. Any by default.
+
+        Returns:
+            List[Union[ArithmeticProblem, ShapeProblem]]: The questions.\
+                Fewer than count only when the level has fewer questions,\
+                none when the bank has no question of the kind and topic.\
+                ProblemQueue then generates them instead.
+        """
+
+        levels = {
+            group_level
+            for group_kind, group_level, group_topic in self._groups
+            if group_kind == kind and topic in (None, group_topic)
+        }
+        if not levels or count <= 0:
+            return []
+        nearest = min(levels, key=lambda candidate: (abs(candidate - level), candidate))
+
+        positions = np.concatenate(
+            [
+                np.arange(group.start, group.stop)
+                for group in self.select(kind, nearest, topic)
+            ]
+        )
+        # Latest pick of each recent position, older ones are asked again first
+        last_picked = {index: order for order, index in enumerate(self._recent)}
+        recent = np.isin(positions, np.fromiter(last_picked, np.int64))
+        stale = sorted(positions[recent].tolist(), key=last_picked.__getitem__)
+        fresh = positions[~recent]
+        picks = self.rng.choice(fresh, min(count, len(fresh)), replace=False)
+        # Questions asked recently only make up for a level running dry
+        indices = (picks.tolist() + stale)[:count]
+        self._recent.extend(indices)
+        return [self[index] for index in indices]
+
+    def close(self) -> None:
+        """Unmap the bank file"""
+
+        self._map.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compile question sets into a bank.")
+    parser.add_argument("sources", nargs="+", help="JSON or CSV question sets")
+    parser.add_argument("-o", "--output", required=True, help="question bank file")
+    args = parser.parse_args()
+    print(build_bank(args.sources, args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from core.ui.shapes import SHAPE_COLORS, SHAPE_KINDS, ShapeSpec
+
+ADD, SUBTRACT, MULTIPLY, DIVIDE = "+", "-", "×", "÷"
+OPERATORS = (ADD, SUBTRACT, MULTIPLY, DIVIDE)
+
+
+@dataclass(frozen=True)
+class Difficulty:
+    """Parameters of the questions at one difficulty level"""
+
+    level: int
+    operators: Tuple[str, ...]
+    # Largest operand of additions and subtractions
+    add_max: int
+    # Largest operand of multiplications, and divisor and quotient of divisions
+    mul_max: int
+    options: int
+    # Number of shape kinds used, from the start of SHAPE_KINDS
+    shape_kinds: int
+    shape_options: int
+    rotate_shapes: bool = False
+    # All options of a shape question share one color, so only the shape tells
+    same_color: bool = False
+
+
+DIFFICULTY_LEVELS = (
+    Difficulty(1, (ADD,), 10, 1, 3, 4, 3),
+    Difficulty(2, (ADD, SUBTRACT), 20, 5, 4, 6, 3),
+    Difficulty(3, (ADD, SUBTRACT, MULTIPLY), 50, 10, 4, 8, 4, rotate_shapes=True),
+    Difficulty(4, OPERATORS, 100, 12, 4, 10, 4, rotate_shapes=True, same_color=True),
+    Difficulty(5, OPERATORS, 1000, 20, 5, 10, 5, rotate_shapes=True, same_color=True),
+)
+
+
+def difficulty(level: int) -> Difficulty:
+    """Return the parameters of a level, clamped to the defined levels"""
+
+    return DIFFICULTY_LEVELS[min(max(level, 1), len(DIFFICULTY_LEVELS)) - 1]
+
+
+@dataclass(frozen=True)
+class ArithmeticProblem:
+    """An arithmetic question with answer options"""
+
+    left: int
+    operator: str
+    right: int
+    answer: int
+    options: Tuple[int, ...]
+    # Index of the answer in options
+    answer_index: int
+    level: int = 1
+
+    kind_name = "arithmetic"
+
+    @property
+    def skill(self) -> str:
+        """Skill the question trains, e.g. "arithmetic:+" """
+
+        return f"{self.kind_name}:{self.operator}"
+
+    @property
+    def text(self) -> str:
+        """The question, e.g. "12 × 7 = ?" """
+
+        return f"{self.left} {self.operator} {self.right} = ?"
+
+
+@dataclass(frozen=True)
+class ShapeProblem:
+    """A question asking to select a shape among options"""
+
+    kind: str
+    options: Tuple[str, ...]
+    colors: Tuple[str, ...]
+    rotations: Tuple[int, ...]
+    answer_index: int
+    level: int = 1
+
+    kind_name = "shape"
+    skill = "shape"
+
+    def specs(self, size: int) -> List[ShapeSpec]:
+        """Return the shapes of the options, ready to be rendered
+
+        Args:
+            size (int): Size of every shape in pixels.
+
+        Returns:
+            List[ShapeSpec]: One spec per option.
+        """
+
+        return [
+            ShapeSpec(kind, size, SHAPE_COLORS[color], rotation)
+            for kind, color, rotation in zip(self.options, self.colors, self.rotations)
+        ]
+
+
+class ProblemGenerator:
+    """Synthesizes questions in batches from a seeded random generator.
+
+    All operands, answers and distractors of a batch are drawn at once as
+    arrays. Questions repeated within a batch or asked recently are dropped.
+    """
+
+    # Arithmetic questions remembered to avoid asking them again
+    HISTORY = 256
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        """Create a generator
+
+        Args:
+            seed (Optional[int]): Seed of the random generator, the same seed\
+                gives the same questions. Random by default.
+        """
+
+        self.rng = np.random.default_rng(seed)
+        self._recent = deque(maxlen=self.HISTORY)
+        self._last_shape: Optional[int] = None
+
+    def _arithmetic_arrays(
+        self, count: int, level: Difficulty
+    ) -> Dict[str, np.ndarray]:
+        """Draw operands and answers of count questions"""
+
+        rng = self.rng
+        operators = np.array([OPERATORS.index(op) for op in level.operators])
+        codes = operators[rng.integers(0, len(operators), count)]
+
+        additive = codes <= OPERATORS.index(SUBTRACT)
+        high = np.where(additive, level.add_max, level.mul_max)
+        left = rng.integers(0, high + 1)
+        right = rng.integers(0, high + 1)
+
+        # Subtractions stay non-negative
+        subtract = codes == OPERATORS.index(SUBTRACT)
+        left, right = (
+            np.where(subtract, np.maximum(left, right), left),
+            np.where(subtract, np.minimum(left, right), right),
+        )
+
+        # Divisions are built from their answer so they come out even
+        divide = codes == OPERATORS.index(DIVIDE)
+        right = np.where(divide, np.maximum(right, 1), right)
+        quotient = left
+        left = np.where(divide, right * quotient, left)
+
+        answer = np.select(
+            [codes == index for index in range(len(OPERATORS))],
+            [left + right, left - right, left * right, quotient],
+        )
+        return {"code": codes, "left": left, "right": right, "answer": answer}
+
+    def _distinct(self, keys: np.ndarray, seen: Set[int]) -> np.ndarray:
+        """Indices of keys seen neither earlier in the draw, nor in seen, nor\
+        recently"""
+
+        _, first = np.unique(keys, return_index=True)
+        first.sort()
+        excluded = seen.union(self._recent)
+        if excluded:
+            first = first[~np.isin(keys[first], np.fromiter(excluded, np.int64))]
+        return first
+
+    def answer_options(
+        self, answers: np.ndarray, count: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return shuffled answer options and the answer's index among them
+
+        Distractors are answer ± d for distinct d, so they never repeat and
+        never go below zero.
+
+        Args:
+            answers (np.ndarray): Answer of each question.
+            count (int): Options per question, the answer included.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Options, one row per question,\
+                and the column of each answer.
+        """
+
+        rng = self.rng
+        rows = len(answers)
+        deltas = np.argsort(rng.random((rows, 2 * count)), axis=1)[:, : count - 1] + 1
+        column = answers[:, None]
+        below = (rng.random(deltas.shape) < 0.5) & (column - deltas >= 0)
+        options = np.concatenate(
+            [column, column + np.where(below, -deltas, deltas)], axis=1
+        )
+        options = rng.permuted(options, axis=1)
+        return options, np.argmax(options == column, axis=1)
+
+    def arithmetic_batch(self, count: int, level: int = 1) -> List[ArithmeticProblem]:
+        """Generate distinct arithmetic questions
+
+        Args:
+            count (int): Number of questions.
+            level (int): Difficulty level. Defaults to 1.
+
+        Returns:
+            List[ArithmeticProblem]: The questions. Fewer than count only\
+                when the level has fewer distinct questions.
+        """
+
+        params = difficulty(level)
+        batches = []
+        found = 0
+        # Questions of this batch, never repeated even once the history goes
+        seen: Set[int] = set()
+        # Draw extra to make up for duplicates, give up on tiny levels
+        for attempt in range(4):
+            if attempt == 2:
+                # The level ran out of questions not asked recently
+                self._recent.clear()
+            arrays = self._arithmetic_arrays(2 * (count - found), params)
+            keys = (arrays["code"] * (1 << 24) + arrays["left"]) * (1 << 24) + arrays[
+                "right"
+            ]
+            keep = self._distinct(keys, seen)[: count - found]
+            kept = keys[keep].tolist()
+            seen.update(kept)
+            self._recent.extend(kept)
+            batches.append({name: values[keep] for name, values in arrays.items()})
+            found += len(keep)
+            if found >= count:
+                break
+
+        arrays = {
+            name: np.concatenate([batch[name] for batch in batches])
+            for name in batches[0]
+        }
+        options, answer_index = self.answer_options(arrays["answer"], params.options)
+        return [
+            ArithmeticProblem(
+                left, OPERATORS[code], right, answer, tuple(row), index, params.level
+            )
+            for code, left, right, answer, row, index in zip(
+                arrays["code"].tolist(),
+                arrays["left"].tolist(),
+                arrays["right"].tolist(),
+                arrays["answer"].tolist(),
+                options.tolist(),
+                answer_index.tolist(),
+            )
+        ]
+
+    def shape_batch(self, count: int, level: int = 1) -> List[ShapeProblem]:
+        """Generate shape questions, never the same shape twice in a row
+
+        Args:
+            count (int): Number of questions.
+            level (int): Difficulty level. Defaults to 1.
+
+        Returns:
+            List[ShapeProblem]: The questions.
+        """
+
+        params = difficulty(level)
+        rng = self.rng
+        kinds = SHAPE_KINDS[: params.shape_kinds]
+        colors = tuple(SHAPE_COLORS)
+        total = len(kinds)
+        options = min(params.shape_options, total)
+
+        # Stepping by 1 to total - 1 kinds never lands on the same kind
+        start = rng.integers(total) if self._last_shape is None else self._last_shape
+        targets = (start + np.cumsum(rng.integers(1, total, count))) % total
+        self._last_shape = int(targets[-1]) if count else self._last_shape
+
+        order = np.argsort(rng.random((count, total)), axis=1)
+        others = order[order != targets[:, None]].reshape(count, total - 1)
+        choices = rng.permuted(
+            np.concatenate([targets[:, None], others[:, : options - 1]], axis=1), axis=1
+        )
+        answer_index = np.argmax(choices == targets[:, None], axis=1)
+
+        if params.same_color:
+            shape_colors = np.repeat(
+                rng.integers(0, len(colors), (count, 1)), options, axis=1
+            )
+        else:
+            shape_colors = rng.integers(0, len(colors), (count, options))
+        rotations = (
+            rng.integers(0, 360, (count, options))
+            if params.rotate_shapes
+            else np.zeros((count, options), np.int64)
+        )
+
+        return [
+            ShapeProblem(
+                kinds[row[index]],
+                tuple(kinds[choice] for choice in row),
+                tuple(colors[color] for color in color_row),
+                tuple(rotation_row),
+                index,
+                params.level,
+            )
+            for row, index, color_row, rotation_row in zip(
+                choices.tolist(),
+                answer_index.tolist(),
+                shape_colors.tolist(),
+                rotations.tolist(),
+            )
+        ]
+
+    def batch(self, kind: str, count: int, level: int = 1) -> list:
+        """Generate questions of a kind
+
+        Args:
+            kind (str): "arithmetic" or "shape".
+            count (int): Number of questions.
+            level (int): Difficulty level. Defaults to 1.
+
+        Returns:
+            list: The questions.
+        """
+
+        if kind == "arithmetic":
+            return self.arithmetic_batch(count, level)
+        if kind == "shape":
+            return self.shape_batch(count, level)
+        raise ValueError(f"Unknown kind of question {kind}")
@@ -0,0 +1,131 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from collections import deque
+from typing import Optional, Union
+
+from core.problems.bank import QuestionBank
+from core.problems.generator import ProblemGenerator
+from core.utils import logger
+
+
+class ProblemQueue:
+    """Questions of one kind generated ahead of the player.
+
+    ``refill`` tops the queue up in a single batch and is meant for frames
+    with spare time, so ``next`` only generates on the spot when the player
+    outran the prefetching.
+
+    The source of the questions may also be a QuestionBank. When it has no
+    questions of the kind, they come from a ProblemGenerator instead.
+    """
+
+    def __init__(
+        self,
+        generator: Union[ProblemGenerator, QuestionBank],
+        kind: str = "shape",
+        ahead: int = 32,
+        level: int = 1,
+        fallback: Optional[ProblemGenerator] = None,
+    ) -> None:
+        """Create an empty queue
+
+        Args:
+            generator (Union[ProblemGenerator, QuestionBank]): Source of the\
+                questions.
+            kind (str): "arithmetic" or "shape". Defaults to "shape".
+            ahead (int): Questions kept ready. Defaults to 32.
+            level (int): Difficulty level. Defaults to 1.
+            fallback (Optional[ProblemGenerator]): Generator used when the\
+                source gives no questions. A randomly seeded one by default.
+        """
+
+        self.generator = generator
+        self.fallback = fallback
+        self.kind = kind
+        self.ahead = ahead
+        self._level = level
+        self._queue = deque()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    @property
+    def level(self) -> int:
+        """Difficulty level of the queued questions"""
+
+        return self._level
+
+    @level.setter
+    def level(self, level: int) -> None:
+        if level != self._level:
+            # Questions of the old level are no use any more
+            self._level = level
+            self._queue.clear()
+
+    def refill(self, force: bool = False) -> bool:
+        """Generate a batch if the queue ran below half of ahead
+
+        Args:
+            force (bool): Fill up even if more than half is left.
+
+        Returns:
+            bool: Whether questions were generated.
+        """
+
+        missing = self.ahead - len(self._queue)
+        if missing <= 0 or (not force and missing < self.ahead // 2):
+            return False
+        problems = self.generator.batch(self.kind, missing, self._level)
+        if not problems:
+            logger.debug(f"No {self.kind} questions in the source, generating them")
+            if self.fallback is None:
+                self.fallback = ProblemGenerator()
+            problems = self.fallback.batch(self.kind, missing, self._level)
+        self._queue.extend(problems)
+        return True
+
+    def next(self):
+        """Return the next question, generating a batch if none is left"""
+
+        if not self._queue:
+            logger.debug(f"Generating {self.kind} questions on demand")
+            self.refill(force=True)
+        return self._queue.popleft()
+
+    def peek(self, count: int = 1) -> list:
+        """Return upcoming questions without taking them, e.g. to preload\
+        what they show
+
+        Args:
+            count (int): Number of questions. Defaults to 1.
+
+        Returns:
+            list: Up to count questions.
+        """
+
+        return [self._queue[index] for index in range(min(count, len(self._queue)))]
+
+    def clear(self) -> None:
+        """Drop every queued question"""
+
+        self._queue.clear()
@@ -0,0 +1,337 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from dataclasses import dataclass
+import json
+import os
+import struct
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.problems import AdaptiveDifficulty, OPERATORS
+from core.utils import atomic_write, logger
+
+# magic, version, sequence number of the first attempt in the log
+LOG_HEADER = struct.Struct("<4sHxxQ")
+LOG_MAGIC = b"BMPL"
+LOG_VERSION = 1
+
+# time, kind, operator, level, correct, seconds
+ATTEMPT = struct.Struct("<dBBBBf")
+KINDS = ("arithmetic", "shape")
+NO_OPERATOR = 255
+
+SNAPSHOT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class Attempt:
+    """An answered question as stored in the progress log"""
+
+    time: float
+    kind_name: str
+    operator: Optional[str]
+    level: int
+    correct: bool
+    seconds: float
+
+    @property
+    def skill(self) -> str:
+        """Skill of the question, as the problem itself names it"""
+
+        if self.operator:
+            return f"{self.kind_name}:{self.operator}"
+        return self.kind_name
+
+    @classmethod
+    def of(cls, problem, correct: bool, seconds: float) -> "Attempt":
+        """Describe an answer to a question"""
+
+        return cls(
+            time.time(),
+            problem.kind_name,
+            getattr(problem, "operator", None),
+            problem.level,
+            bool(correct),
+            float(seconds),
+        )
+
+    def pack(self) -> bytes:
+        return ATTEMPT.pack(
+            self.time,
+            KINDS.index(self.kind_name),
+            OPERATORS.index(self.operator) if self.operator else NO_OPERATOR,
+            self.level,
+            self.correct,
+            self.seconds,
+        )
+
+    @classmethod
+    def unpack_from(cls, buffer, offset: int = 0) -> "Attempt":
+        when, kind, operator, level, correct, seconds = ATTEMPT.unpack_from(
+            buffer, offset
+        )
+        return cls(
+            when,
+            KINDS[kind],
+            None if operator == NO_OPERATOR else OPERATORS[operator],
+            level,
+            bool(correct),
+            seconds,
+        )
+
+
+class ProgressStore:
+    """Learner progress as a small snapshot plus an append-only attempt log.
+
+    Every answer is appended to a log of fixed-size binary records in the
+    activity's data directory, so saving only writes what is new. The
+    Journal entry holds a snapshot of the learner model, whose size does not
+    grow with the number of attempts. Resuming loads the newest snapshot and
+    replays only the attempts logged after it. Once the log has grown past
+    COMPACT_AFTER attempts it is cut down to the ones after a fresh snapshot.
+    """
+
+    COMPACT_AFTER = 1000
+    # Pending attempts written out without waiting for a save
+    FLUSH_AFTER = 16
+
+    def __init__(self, directory: str, name: str) -> None:
+        """Create a store
+
+        Args:
+            directory (str): Directory of the logs and local snapshots.
+            name (str): Name of the progress, e.g. the activity id, so every\
+                Journal entry keeps its own log.
+        """
+
+        self.directory = directory
+        self.name = name
+        self.log_path = os.path.join(directory, f"{name}.log")
+        self.snapshot_path = os.path.join(directory, f"{name}.snapshot")
+        # Sequence number of the next attempt
+        self.sequence = 0
+        self._log_base = 0
+        self._pending: List[Attempt] = []
+        self.totals = {"attempts": 0, "correct": 0}
+
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError:
+            logger.warning(
+                f"Cannot create progress directory {directory}.", exc_info=True
+            )
+
+    def _atomic_write(self, path: str, data: bytes) -> None:
+        with atomic_write(path) as temporary_file:
+            temporary_file.write(data)
+
+    def record(self, problem, correct: bool, seconds: float) -> None:
+        """Add an answer, written out on the next flush
+
+        Args:
+            problem (Union[ArithmeticProblem, ShapeProblem]): The question.
+            correct (bool): Whether the answer was right.
+            seconds (float): Time taken to answer.
+        """
+
+        self._pending.append(Attempt.of(problem, correct, seconds))
+        self.sequence += 1
+        self.totals["attempts"] += 1
+        self.totals["correct"] += bool(correct)
+        if len(self._pending) >= self.FLUSH_AFTER:
+            self.flush()
+
+    def flush(self) -> None:
+        """Append pending attempts to the log in a single write"""
+
+        if not self._pending:
+            return
+        data = b"".join(attempt.pack() for attempt in self._pending)
+        try:
+            if not os.path.exists(self.log_path):
+                self._log_base = self.sequence - len(self._pending)
+                data = LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, self._log_base) + data
+            with open(self.log_path, "ab") as log_file:
+                log_file.write(data)
+        except OSError:
+            logger.warning("Unable to write progress log.", exc_info=True)
+            return
+        self._pending.clear()
+
+    def _read_log(self) -> Iterator[Tuple[int, Attempt]]:
+        """Attempts of the log with their sequence numbers"""
+
+        try:
+            with open(self.log_path, "rb") as log_file:
+                data = log_file.read()
+        except FileNotFoundError:
+            return
+        magic, version, base = LOG_HEADER.unpack_from(data)
+        if magic != LOG_MAGIC or version != LOG_VERSION:
+            raise ValueError(f"{self.log_path} is not a progress log")
+        self._log_base = base
+        count, torn = divmod(len(data) - LOG_HEADER.size, ATTEMPT.size)
+        if torn:
+            # Cut a record half written before a crash, so appends line up
+            os.truncate(self.log_path, len(data) - torn)
+        for index in range(count):
+            yield base + index, Attempt.unpack_from(
+                data, LOG_HEADER.size + index * ATTEMPT.size
+            )
+
+    def _snapshot(self, model: AdaptiveDifficulty) -> bytes:
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "name": self.name,
+            "sequence": self.sequence,
+            "totals": self.totals,
+            "model": model.to_dict(),
+        }
+        return json.dumps(snapshot, separators=(",", ":")).encode()
+
+    @staticmethod
+    def _load_snapshot(path: Optional[str]) -> Optional[Dict]:
+        if not path:
+            return None
+        try:
+            with open(path, "rb") as snapshot_file:
+                snapshot = json.loads(snapshot_file.read() or b"null")
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            logger.warning(
+                f"Ignoring unreadable progress snapshot {path}.", exc_info=True
+            )
+            return None
+        if (
+            not isinstance(snapshot, dict)
+            or snapshot.get("version") != SNAPSHOT_VERSION
+        ):
+            return None
+        return snapshot
+
+    def save(self, journal_path: str, model: AdaptiveDifficulty) -> None:
+        """Write the progress for the Journal
+
+        Args:
+            journal_path (str): File the Journal stores, given to write_file.
+            model (AdaptiveDifficulty): Current learner model.
+        """
+
+        self.flush()
+        snapshot = self._snapshot(model)
+        with open(journal_path, "wb") as journal_file:
+            journal_file.write(snapshot)
+
+        if self.sequence - self._log_base >= self.COMPACT_AFTER:
+            self.compact(model, snapshot)
+
+    def compact(
+        self, model: AdaptiveDifficulty, snapshot: Optional[bytes] = None
+    ) -> None:
+        """Store a local snapshot and drop the attempts it covers from the log
+
+        Args:
+            model (AdaptiveDifficulty): Current learner model.
+            snapshot (Optional[bytes]): The model already serialized.
+        """
+
+        self.flush()
+        if snapshot is None:
+            snapshot = self._snapshot(model)
+        try:
+            # Snapshot first: after a crash in between, replay skips the
+            # attempts of the old log the snapshot covers
+            self._atomic_write(self.snapshot_path, snapshot)
+        except OSError:
+            logger.warning("Unable to compact progress log.", exc_info=True)
+            return
+        self._restart_log()
+        logger.debug(f"Compacted progress log at attempt {self.sequence}")
+
+    def resume(self, journal_path: Optional[str] = None) -> AdaptiveDifficulty:
+        """Restore the learner model from the newest snapshot and the log tail
+
+        Args:
+            journal_path (Optional[str]): File from the Journal, given to\
+                read_file. None to resume from local files only.
+
+        Returns:
+            AdaptiveDifficulty: The restored learner model.
+        """
+
+        snapshot = self._load_snapshot(journal_path)
+        # The local files belong to this name, a Journal entry copied from
+        # another one brings its progress but none of its log
+        replay = snapshot is None or snapshot.get("name") == self.name
+        if replay:
+            local = self._load_snapshot(self.snapshot_path)
+            if local and (snapshot is None or local["sequence"] > snapshot["sequence"]):
+                snapshot = local
+
+        model = AdaptiveDifficulty.from_dict(snapshot and snapshot["model"])
+        self.sequence = snapshot["sequence"] if snapshot else 0
+        self.totals = {"attempts": 0, "correct": 0}
+        self.totals.update(snapshot["totals"] if snapshot else {})
+        self._pending.clear()
+
+        replayed = 0
+        log_end = None
+        if replay:
+            try:
+                for sequence, attempt in self._read_log():
+                    log_end = sequence + 1
+                    if sequence < self.sequence:
+                        continue
+                    model.record(attempt, attempt.correct, attempt.seconds)
+                    self.sequence = sequence + 1
+                    self.totals["attempts"] += 1
+                    self.totals["correct"] += attempt.correct
+                    replayed += 1
+            except (OSError, ValueError, struct.error):
+                logger.warning("Discarding unreadable progress log.", exc_info=True)
+                log_end = -1
+
+        if log_end is None and replay and os.path.exists(self.log_path):
+            log_end = self._log_base
+        if log_end != self.sequence:
+            # New attempts must continue the log right where the snapshot ends
+            self._restart_log()
+
+        logger.info(
+            f"Resumed progress at attempt {self.sequence}, "
+            f"{replayed} replayed from the log"
+        )
+        return model
+
+    def _restart_log(self) -> None:
+        """Replace the log by an empty one starting at the current attempt"""
+
+        try:
+            self._atomic_write(
+                self.log_path, LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, self.sequence)
+            )
+        except OSError:
+            logger.warning("Unable to write progress log.", exc_info=True)
+            return
+        self._log_base = self.sequence
@@ -0,0 +1,423 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from core.utils import logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    learner TEXT NOT NULL,
+    started REAL NOT NULL,
+    ended REAL
+);
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY,
+    session TEXT NOT NULL REFERENCES sessions (id),
+    learner TEXT NOT NULL,
+    skill TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    time REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS skill_totals (
+    learner TEXT NOT NULL,
+    skill TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    last_time REAL NOT NULL,
+    PRIMARY KEY (learner, skill)
+);
+CREATE INDEX IF NOT EXISTS attempts_learner_skill_time
+    ON attempts (learner, skill, time);
+CREATE INDEX IF NOT EXISTS attempts_session ON attempts (session);
+CREATE INDEX IF NOT EXISTS sessions_learner_started ON sessions (learner, started);
+"""
+
+INSERT_ATTEMPT = """
+INSERT INTO attempts (session, learner, skill, kind, level, correct, seconds, time)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+UPSERT_SKILL = """
+INSERT INTO skill_totals (learner, skill, attempts, correct, seconds, last_time)
+VALUES (?, ?, 1, ?, ?, ?)
+ON CONFLICT (learner, skill) DO UPDATE SET
+    attempts = attempts + 1,
+    correct = correct + excluded.correct,
+    seconds = seconds + excluded.seconds,
+    last_time = excluded.last_time
+"""
+
+
+class ResultsStore:
+    """Local SQLite database of sessions, attempts and per-skill totals.
+
+    Writes are queued and committed by a worker thread, many per
+    transaction, so the frame loop never waits for the disk. Queries either
+    run right away on a separate connection, or with ``request`` on the
+    worker thread after every queued write, with the result handed back on
+    the main thread by ``deliver_pending``.
+    """
+
+    # Most queued writes committed in a single transaction
+    BATCH_SIZE = 256
+    # Methods that request may run on the worker thread
+    QUERIES = ("session_summary", "skill_summary", "skill_history", "sessions")
+
+    def __init__(self, path: str) -> None:
+        """Open or create a results database
+
+        Args:
+            path (str): Path of the database file.
+        """
+
+        self.path = path
+        self._queue = queue.Queue()
+        self._results = queue.Queue()
+        self._learners: Dict[str, str] = {}
+        self._reader: Optional[sqlite3.Connection] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path)
+        connection.row_factory = sqlite3.Row
+        # Readers do not block the writer and commits skip most fsyncs
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _submit(self, operation: Tuple) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._write_loop, name="results-writer", daemon=True
+            )
+            self._thread.start()
+        self._queue.put(operation)
+
+    def _write_loop(self) -> None:
+        """Commit queued writes in batches until closed. Worker thread only."""
+
+        try:
+            connection = self._connect()
+            connection.executescript(SCHEMA)
+        except sqlite3.Error:
+            logger.error(
+                f"Unable to open results database {self.path}.", exc_info=True
+            )
+            connection = None
+
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            writes = []
+            for operation in batch:
+                if operation[0] == "close":
+                    running = False
+                elif operation[0] in ("query", "sync"):
+                    # Everything queued before has to be committed first
+                    self._commit(connection, writes)
+                    writes = []
+                    self._answer(connection, operation)
+                else:
+                    writes.append(operation)
+            self._commit(connection, writes)
+
+        if connection is not None:
+            connection.close()
+
+    def _commit(self, connection: Optional[sqlite3.Connection], writes: List) -> None:
+        if not writes or connection is None:
+            return
+        try:
+            with connection:
+                for operation in writes:
+                    kind, *args = operation
+                    if kind == "attempt":
+                        _, learner, skill, _, _, correct, seconds, when = args
+                        connection.execute(INSERT_ATTEMPT, args)
+                        connection.execute(
+                            UPSERT_SKILL, (learner, skill, correct, seconds, when)
+                        )
+                    elif kind == "start":
+                        connection.execute(
+                            "INSERT OR IGNORE INTO sessions (id, learner, started)"
+                            " VALUES (?, ?, ?)",
+                            args,
+                        )
+                    elif kind == "end":
+                        connection.execute(
+                            "UPDATE sessions SET ended = ? WHERE id = ?", args
+                        )
+        except Exception:
+            # Keep the worker alive, later writes may still succeed
+            logger.error(f"Lost {len(writes)} results writes.", exc_info=True)
+
+    def _answer(
+        self, connection: Optional[sqlite3.Connection], operation: Tuple
+    ) -> None:
+        kind, event_or_callback, name, args = operation
+        if kind == "sync":
+            event_or_callback.set()
+            return
+        try:
+            result = getattr(self, name)(*args, connection=connection)
+        except Exception:
+            logger.warning(f"Results query {name} failed.", exc_info=True)
+            result = None
+        self._results.put((event_or_callback, result))
+
+    def start_session(self, learner: str) -> str:
+        """Start a session of a learner
+
+        Args:
+            learner (str): Name of the learner.
+
+        Returns:
+            str: Id of the new session.
+        """
+
+        session = uuid.uuid4().hex
+        self._learners[session] = learner
+        self._submit(("start", session, learner, time.time()))
+        return session
+
+    def end_session(self, session: str) -> None:
+        """Mark a session as finished"""
+
+        self._submit(("end", time.time(), session))
+
+    def record(self, session: str, problem, correct: bool, seconds: float) -> None:
+        """Queue an answer for writing
+
+        Args:
+            session (str): Id of the session.
+            problem (Union[ArithmeticProblem, ShapeProblem]): The question.
+            correct (bool): Whether the answer was right.
+            seconds (float): Time taken to answer.
+        """
+
+        self._submit(
+            (
+                "attempt",
+                session,
+                self._learners.get(session, ""),
+                problem.skill,
+                problem.kind_name,
+                problem.level,
+                int(bool(correct)),
+                float(seconds),
+                time.time(),
+            )
+        )
+
+    def request(
+        self, name: str, *args: Any, callback: Callable[[Any], None]
+    ) -> None:
+        """Run a query after every queued write without waiting for it
+
+        Args:
+            name (str): Name of a query method in QUERIES, e.g.\
+                "session_summary".
+            args (Any): Arguments of the query.
+            callback (Callable[[Any], None]): Called with the result by\
+                deliver_pending on the main thread, None if the query failed.
+
+        Raises:
+            ValueError: If name is not a query method.
+        """
+
+        if name not in self.QUERIES:
+            raise ValueError(f"Unknown results query {name!r}")
+        self._submit(("query", callback, name, args))
+
+    def deliver_pending(self) -> int:
+        """Hand finished requests to their callbacks. Main thread only.
+
+        Returns:
+            int: Number of callbacks called.
+        """
+
+        count = 0
+        while True:
+            try:
+                callback, result = self._results.get_nowait()
+            except queue.Empty:
+                return count
+            callback(result)
+            count += 1
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued write is committed
+
+        Args:
+            timeout (Optional[float]): Seconds to wait at most.
+
+        Returns:
+            bool: Whether everything was committed in time.
+        """
+
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._submit(("sync", done, None, ()))
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Commit what is queued and stop the worker thread
+
+        Args:
+            timeout (Optional[float]): Seconds to wait for the worker thread.
+        """
+
+        if self._thread is not None:
+            self._queue.put(("close",))
+            self._thread.join(timeout)
+            self._thread = None
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def _read(self, connection: Optional[sqlite3.Connection]) -> sqlite3.Connection:
+        if connection is not None:
+            return connection
+        if self._reader is None:
+            self._reader = self._connect()
+            self._reader.executescript(SCHEMA)
+        return self._reader
+
+    def session_summary(
+        self, session: str, connection: Optional[sqlite3.Connection] = None
+    ) -> Dict[str, float]:
+        """Return the totals of a session
+
+        Args:
+            session (str): Id of the session.
+
+        Returns:
+            Dict[str, float]: attempts, correct, accuracy and mean seconds.
+        """
+
+        row = self._read(connection).execute(
+            "SELECT COUNT(*) AS attempts, COALESCE(SUM(correct), 0) AS correct,"
+            " COALESCE(AVG(seconds), 0) AS seconds FROM attempts WHERE session = ?",
+            (session,),
+        ).fetchone()
+        summary = dict(row)
+        summary["accuracy"] = (
+            summary["correct"] / summary["attempts"] if summary["attempts"] else 0.0
+        )
+        return summary
+
+    def skill_summary(
+        self, learner: str, connection: Optional[sqlite3.Connection] = None
+    ) -> List[Dict[str, Any]]:
+        """Return the running totals of every skill of a learner
+
+        Args:
+            learner (str): Name of the learner.
+
+        Returns:
+            List[Dict[str, Any]]: skill, attempts, correct, accuracy,\
+                mean seconds and last time, weakest skill first.
+        """
+
+        rows = self._read(connection).execute(
+            "SELECT skill, attempts, correct, seconds / attempts AS seconds, last_time,"
+            " CAST(correct AS REAL) / attempts AS accuracy"
+            " FROM skill_totals WHERE learner = ? ORDER BY accuracy, skill",
+            (learner,),
+        )
+        return [dict(row) for row in rows]
+
+    def skill_history(
+        self,
+        learner: str,
+        skill: str,
+        since: Optional[float] = None,
+        bucket: float = 86400.0,
+        connection: Optional[sqlite3.Connection] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return a learner's results in a skill over time
+
+        Args:
+            learner (str): Name of the learner.
+            skill (str): Skill, e.g. "arithmetic:+".
+            since (Optional[float]): Unix time of the first attempt counted.\
+                All attempts by default.
+            bucket (float): Seconds per row. Defaults to a day.
+
+        Returns:
+            List[Dict[str, Any]]: start, attempts, correct, accuracy and mean\
+                seconds of every period with attempts, oldest first.
+        """
+
+        rows = self._read(connection).execute(
+            "SELECT CAST(time / :bucket AS INTEGER) * :bucket AS start,"
+            " COUNT(*) AS attempts, SUM(correct) AS correct,"
+            " AVG(correct) AS accuracy, AVG(seconds) AS seconds"
+            " FROM attempts WHERE learner = :learner AND skill = :skill"
+            " AND time >= :since GROUP BY start ORDER BY start",
+            {"bucket": bucket, "learner": learner, "skill": skill, "since": since or 0},
+        )
+        return [dict(row) for row in rows]
+
+    def sessions(
+        self,
+        learner: str,
+        limit: int = 10,
+        connection: Optional[sqlite3.Connection] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return a learner's latest sessions with their totals
+
+        Args:
+            learner (str): Name of the learner.
+            limit (int): Most sessions returned. Defaults to 10.
+
+        Returns:
+            List[Dict[str, Any]]: id, started, ended, attempts and correct,\
+                newest first.
+        """
+
+        rows = self._read(connection).execute(
+            "SELECT sessions.id, started, ended, COUNT(attempts.id) AS attempts,"
+            " COALESCE(SUM(attempts.correct), 0) AS correct FROM sessions"
+            " LEFT JOIN attempts ON attempts.session = sessions.id"
+            " WHERE sessions.learner = ? GROUP BY sessions.id"
+            " ORDER BY started DESC LIMIT ?",
+            (learner, limit),
+        )
+        return [dict(row) for row in rows]
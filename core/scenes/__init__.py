@@ -0,0 +1,5 @@
+from .scene import Scene
+from .manager import SceneManager
+from .menu import MenuScene
+from .question import QuestionScene
+from .results import ResultsScene
@@ -0,0 +1,191 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from collections import deque
+from typing import Callable, Dict, Optional, Sequence
+
+from core.scenes.scene import Scene
+from core.utils import logger, strings
+
+
+class SceneManager:
+    """State machine switching between the game's scenes.
+
+    Scenes are constructed lazily on first use and cached afterwards. Scenes
+    queued with ``preload`` have their asset groups loaded on the asset
+    worker thread and are then built one per frame by ``preload_step`` while
+    another scene is showing, so switching to them later costs a single frame.
+    """
+
+    def __init__(self, game) -> None:
+        """Create a scene manager
+
+        Args:
+            game (Game): Game instance whose renderer shows the scenes.
+        """
+
+        self.game = game
+        self.current: Optional[Scene] = None
+        self.current_name: Optional[str] = None
+        self._factories: Dict[str, Callable[..., Scene]] = {}
+        self._scenes: Dict[str, Scene] = {}
+        self._preload_queue = deque()
+
+    def register(
+        self, name: str, factory: Callable[..., Scene], preload: bool = False
+    ) -> None:
+        """Register a scene
+
+        Args:
+            name (str): Name used to switch to the scene.
+            factory (Callable[..., Scene]): Scene class or factory taking the game.
+            preload (bool): Build the scene in the background as soon as\
+                possible. Defaults to False.
+        """
+
+        self._factories[name] = factory
+        if preload:
+            self.preload(name)
+
+    def get(self, name: str) -> Scene:
+        """Return a scene, constructing and building it if needed
+
+        Args:
+            name (str): Name of the scene.
+
+        Returns:
+            Scene: The built scene.
+        """
+
+        scene = self._scenes.get(name)
+        if scene is None:
+            scene = self._scenes[name] = self._factories[name](self.game)
+        scene.ensure_built()
+        return scene
+
+    def preload(self, *names: str) -> None:
+        """Queue scenes to be built in the background
+
+        Args:
+            names (str): Names of the scenes.
+        """
+
+        for name in names:
+            # File I/O starts right away on the asset worker thread
+            asset_groups = getattr(self._factories[name], "ASSET_GROUPS", ())
+            if asset_groups:
+                self.game.assets.preload(*asset_groups)
+
+            if name not in self._preload_queue:
+                self._preload_queue.append(name)
+
+    def preload_step(self) -> bool:
+        """Build the next queued scene, if any
+
+        Returns:
+            bool: Whether a scene was built.
+        """
+
+        while self._preload_queue:
+            name = self._preload_queue[0]
+            asset_groups = getattr(self._factories[name], "ASSET_GROUPS", ())
+            if not all(self.game.assets.is_ready(group) for group in asset_groups):
+                # Building now would block on the asset worker thread
+                return False
+
+            self._preload_queue.popleft()
+            scene = self._scenes.get(name)
+            if scene is None or scene.stale:
+                logger.debug(f"Preloading scene {name}")
+                self.get(name)
+                return True
+        return False
+
+    def switch(self, name: str, **kwargs) -> Scene:
+        """Make another scene the current one
+
+        Args:
+            name (str): Name of the scene.
+            kwargs: Passed on to the scene's enter method.
+
+        Returns:
+            Scene: The new current scene.
+        """
+
+        scene = self.get(name)
+        if self.current:
+            self.current.exit()
+            self.current.reset_pointer()
+
+        self.current = scene
+        self.current_name = name
+        scene.enter(**kwargs)
+        self.game.renderer.set_widgets(scene.widgets)
+        return scene
+
+    def set_language(self, languages: Optional[Sequence[str]] = None) -> None:
+        """Switch the UI language
+
+        The current scene is rebuilt right away, every other built scene is
+        queued to be rebuilt in the background.
+
+        Args:
+            languages (Optional[Sequence[str]]): Languages in order of\
+                preference. None for the locale environment variables.
+        """
+
+        version = strings.version
+        strings.set_language(languages)
+        if strings.version == version:
+            return
+
+        logger.info(f"Switched language to {strings.language}")
+        self.preload(
+            *(
+                name
+                for name, scene in self._scenes.items()
+                if scene.built and scene is not self.current
+            )
+        )
+        if self.current:
+            self.current.reset_pointer()
+            self.current.ensure_built()
+            self.current.enter()
+            self.game.renderer.set_widgets(self.current.widgets)
+
+    def handle_event(self, event) -> None:
+        """Forward an event to the current scene"""
+
+        if self.current:
+            self.current.handle_event(event)
+
+    def hover(self, pos) -> None:
+        """Resolve hover state of the current scene for a pointer position"""
+
+        if self.current:
+            self.current.hover(pos)
+
+    def update(self, dt: float) -> None:
+        """Advance the current scene by one fixed step"""
+
+        if self.current:
+            self.current.update(dt)
@@ -0,0 +1,57 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from core.scenes.scene import Scene
+from core.ui import TextBox
+from core.utils import N_ as _
+
+
+class MenuScene(Scene):
+    """Main menu with the game title"""
+
+    STRINGS = {
+        "play": _("Play"),
+        "quit": _("Quit"),
+        "title": _("Select the correct shape"),
+    }
+
+    def build(self) -> None:
+        self.play_button = self.add_button(
+            self.strings["play"],
+            475,
+            180,
+            lambda: self.game.scenes.switch("question"),
+        )
+        self.quit_button = self.add_button(
+            self.strings["quit"], 475, 360, self.game.stop
+        )
+
+        self.title = TextBox(
+            self.strings["title"],
+            *self.game._scale_coordinates(475, 540),
+            font=self.game.font
+        )
+        self.widgets.append(self.title)
+
+    def enter(self, **kwargs) -> None:
+        # Get the first round ready while the player looks at the menu
+        self.game.scenes.preload("question")
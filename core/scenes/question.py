@@ -0,0 +1,141 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+
+from core.scenes.scene import Scene
+from core.ui import GlyphText, ShapeWidget, TextBox
+from core.utils import N_ as _
+
+
+class QuestionScene(Scene):
+    """A round of shape questions from the game's question queue"""
+
+    STRINGS = {
+        "title": _("Select the correct shape"),
+        "done": _("Done"),
+        "circle": _("circle"),
+        "oval": _("oval"),
+        "rectangle": _("rectangle"),
+        "diamond": _("diamond"),
+        "star": _("star"),
+        "triangle": _("triangle"),
+        "square": _("square"),
+        "pentagon": _("pentagon"),
+        "hexagon": _("hexagon"),
+        "octagon": _("octagon"),
+    }
+
+    # Questions in a round
+    ROUND_LENGTH = 10
+    # Size of each option in world pixels
+    SHAPE_SIZE = 96
+
+    def build(self) -> None:
+        self.title = TextBox(
+            self.strings["title"],
+            *self.game._scale_coordinates(320, 40),
+            font=self.game.font
+        )
+        self.widgets.append(self.title)
+
+        # Question number within the round
+        self.counter = GlyphText(
+            "", *self.game._scale_coordinates(320, 130), font=self.game.font
+        )
+        self.widgets.append(self.counter)
+
+        self.done_button = self.add_button(
+            self.strings["done"], 475, 360, lambda: self.game.scenes.switch("results")
+        )
+
+        self.problem = None
+        self.shape_name = None
+        self.options = []
+        self.asked_at = 0.0
+        self.answered = 0
+
+    def enter(self, **kwargs) -> None:
+        self.game.scenes.preload("results")
+        self.answered = 0
+        self.next_question()
+
+    def next_question(self) -> None:
+        """Show the next question of the queue"""
+
+        self.problem = self.game.problem_queues["shape"].next()
+        # The renderer only needs updating while the scene is shown
+        renderer = self.game.renderer if self.game.scenes.current is self else None
+
+        previous = self.options
+        for option in previous:
+            self.remove_interactive(option)
+        if self.shape_name is not None:
+            self.widgets.remove(self.shape_name)
+            previous = [self.shape_name, *previous]
+        if renderer:
+            renderer.remove(*previous)
+
+        self.shape_name = TextBox(
+            self.strings[self.problem.kind],
+            *self.game._scale_coordinates(320, 85),
+            font=self.game.font
+        )
+        self.widgets.append(self.shape_name)
+
+        size = self.game._scale_coordinates(self.SHAPE_SIZE, 0)[0]
+        specs = self.problem.specs(size)
+        self.options = [
+            self.add_interactive(
+                ShapeWidget(
+                    spec,
+                    *self.game._scale_coordinates(
+                        640 * (index + 1) / (len(specs) + 1), 240
+                    )
+                ),
+                lambda index=index: self.answer(index),
+            )
+            for index, spec in enumerate(specs)
+        ]
+        if renderer:
+            renderer.add(self.shape_name, *self.options)
+
+        self.counter.set_text(f"{self.answered + 1} / {self.ROUND_LENGTH}")
+        self.asked_at = time.perf_counter()
+
+    def answer(self, index: int) -> None:
+        """Record the option the player picked and move on
+
+        Args:
+            index (int): Index of the picked option.
+        """
+
+        self.game.record_answer(
+            self.problem,
+            index == self.problem.answer_index,
+            time.perf_counter() - self.asked_at,
+        )
+        self.answered += 1
+        if self.answered >= self.ROUND_LENGTH:
+            self.game.scenes.switch("results")
+        else:
+            self.next_question()
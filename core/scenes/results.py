@@ -0,0 +1,61 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from core.scenes.scene import Scene
+from core.ui import GlyphText, TextBox
+from core.utils import N_ as _
+
+
+class ResultsScene(Scene):
+    """Summary shown at the end of a round"""
+
+    STRINGS = {"title": _("Well done!"), "menu": _("Menu")}
+
+    def build(self) -> None:
+        self.title = TextBox(
+            self.strings["title"],
+            *self.game._scale_coordinates(320, 40),
+            font=self.game.font
+        )
+        self.widgets.append(self.title)
+
+        # Right answers out of all answers of the session
+        self.score = GlyphText(
+            "", *self.game._scale_coordinates(320, 120), font=self.game.font
+        )
+        self.widgets.append(self.score)
+
+        self.menu_button = self.add_button(
+            self.strings["menu"], 475, 360, lambda: self.game.scenes.switch("menu")
+        )
+
+    def enter(self, **kwargs) -> None:
+        # Counted on the results writer thread, after the session's answers
+        self.game.results.request(
+            "session_summary", self.game.session, callback=self.show_summary
+        )
+
+    def show_summary(self, summary) -> None:
+        """Show the score of a session summary from the results store"""
+
+        if summary and summary["attempts"]:
+            self.score.set_text(f"{summary['correct']} / {summary['attempts']}")
@@ -0,0 +1,236 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from typing import Callable, Dict, Optional, SupportsFloat, Tuple
+
+import pygame
+
+from core.ui import font_manager, FontManager, GameButton, SpatialGrid
+from core.utils import strings
+
+
+class Scene:
+    """Base class for a game screen.
+
+    A scene creates its widgets once in ``build`` and keeps them for every
+    later visit, so entering it again only swaps what the renderer draws.
+    Interactive widgets are kept in a spatial index for pointer dispatch.
+    """
+
+    HIT_CELL_SIZE = 64
+
+    # Asset groups the scene uses, loaded in the background when it is preloaded
+    ASSET_GROUPS = ()
+    # Font sizes the scene uses, loaded before it is built
+    FONT_SIZES = (FontManager.DEFAULT_SIZE,)
+    # Untranslated UI strings by key, marked with N_, translated in one batch
+    # into ``strings`` before the scene is built
+    STRINGS: Dict[str, str] = {}
+
+    def __init__(self, game) -> None:
+        """Create an empty scene
+
+        Args:
+            game (Game): Game instance the scene belongs to.
+        """
+
+        self.game = game
+        self.strings: Dict[str, str] = {}
+        self._strings_version = None
+        self.clear()
+
+    @property
+    def stale(self) -> bool:
+        """Whether the scene is not built yet or was built in another language"""
+
+        return not self.built or self._strings_version != strings.version
+
+    def build(self) -> None:
+        """Create the widgets and surfaces of the scene.\
+        Called once, and again after the language changed."""
+
+    def clear(self) -> None:
+        """Drop every widget so the scene can be built again"""
+
+        self.widgets = []
+        self.buttons = []
+        self.actions = {}
+        self.hit_index = SpatialGrid(
+            self.HIT_CELL_SIZE * getattr(self.game, "scale_x", 1)
+        )
+        self._hovered = set()
+        self._pressed = None
+        self.built = False
+
+    def ensure_built(self) -> None:
+        """Build the scene if it was not built yet, or rebuild it in the\
+        current language"""
+
+        if self.stale:
+            if self.built:
+                self.clear()
+            font_manager.prewarm(*self.FONT_SIZES)
+            self.strings = strings.resolve(self.STRINGS)
+            self._strings_version = strings.version
+            self.build()
+            self.built = True
+
+    def add_button(
+        self,
+        label: str,
+        x: SupportsFloat,
+        y: SupportsFloat,
+        action: Callable[[], None],
+        **kwargs,
+    ) -> GameButton:
+        """Create a button that runs an action when clicked
+
+        Args:
+            label (str): Label text.
+            x (SupportsFloat): X coordinate of button in world space.
+            y (SupportsFloat): Y coordinate of button in world space.
+            action (Callable[[], None]): Called when the button is clicked.
+
+        Returns:
+            GameButton: The created button.
+        """
+
+        button = GameButton(
+            label, *self.game._scale_coordinates(x, y), font=self.game.font, **kwargs
+        )
+        self.buttons.append(button)
+        return self.add_interactive(button, action)
+
+    def add_interactive(
+        self,
+        widget,
+        action: Optional[Callable[[], None]] = None,
+        z: Optional[float] = None,
+    ):
+        """Add a widget that reacts to the pointer
+
+        Args:
+            widget: Widget with a ``rect``. Its ``check_mouse_hover`` is\
+                called when the pointer enters or leaves it, if it has one.
+            action (Optional[Callable[[], None]]): Called when the widget is\
+                clicked.
+            z (Optional[float]): Stacking order for hit-testing. Defaults to\
+                the drawing order.
+
+        Returns:
+            The widget.
+        """
+
+        self.widgets.append(widget)
+        self.hit_index.insert(widget, widget.rect, len(self.widgets) if z is None else z)
+        if action:
+            self.actions[widget] = action
+        return widget
+
+    def move_widget(self, widget, x: SupportsFloat, y: SupportsFloat) -> None:
+        """Move an interactive widget and keep the hit index in sync
+
+        Args:
+            widget: An interactive widget of the scene.
+            x (SupportsFloat): New X coordinate on screen.
+            y (SupportsFloat): New Y coordinate on screen.
+        """
+
+        widget.rect.topleft = (x, y)
+        self.hit_index.update(widget, widget.rect)
+
+    def remove_interactive(self, widget) -> None:
+        """Remove an interactive widget from the scene"""
+
+        self.widgets.remove(widget)
+        self.hit_index.remove(widget)
+        self.actions.pop(widget, None)
+        self._hovered.discard(widget)
+        if self._pressed is widget:
+            self._pressed = None
+        if widget in self.buttons:
+            self.buttons.remove(widget)
+
+    def enter(self, **kwargs) -> None:
+        """Called when the scene becomes the current one"""
+
+    def exit(self) -> None:
+        """Called when another scene replaces this one"""
+
+    def reset_pointer(self) -> None:
+        """Forget hover and press state, e.g. when the scene is left"""
+
+        for widget in self._hovered:
+            if hasattr(widget, "check_mouse_hover"):
+                widget.check_mouse_hover((-1, -1))
+        self._hovered = set()
+        if self._pressed is not None and hasattr(self._pressed, "release"):
+            self._pressed.release()
+        self._pressed = None
+
+    def handle_event(self, event: pygame.event.Event) -> None:
+        """Handle an input event while the scene is current
+
+        Args:
+            event (Event): The pygame event.
+        """
+
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            for widget in self.hit_index.query_point(event.pos):
+                if widget in self.actions and getattr(widget, "enabled", True):
+                    self._pressed = widget
+                    if hasattr(widget, "press"):
+                        widget.press()
+                    break
+
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            # A click is a press and release on the same widget
+            widget, self._pressed = self._pressed, None
+            if widget is None:
+                return
+            released = widget.release() if hasattr(widget, "release") else True
+            if released and widget.rect.collidepoint(event.pos):
+                self.actions[widget]()
+
+    def hover(self, pos: Tuple[int, int]) -> None:
+        """Resolve the hover state of every widget for a pointer position.
+
+        Called at most once per frame with the latest pointer position.
+
+        Args:
+            pos (Tuple[int, int]): Pointer position on screen.
+        """
+
+        hits = set(self.hit_index.query_point(pos))
+        # Only widgets the pointer entered or left can change state
+        for widget in hits.symmetric_difference(self._hovered):
+            check_mouse_hover = getattr(widget, "check_mouse_hover", None)
+            if check_mouse_hover:
+                check_mouse_hover(pos)
+        self._hovered = hits
+
+    def update(self, dt: float) -> None:
+        """Advance scene logic by one fixed step
+
+        Args:
+            dt (float): Length of the step in seconds.
+        """
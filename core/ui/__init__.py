@@ -1,5 +1,22 @@
-from .fonts import GameFont
-from .sprite_paths import GAME_BACKGROUND_PATH
+from .assets import Asset, AssetRegistry, DEFAULT_ASSETS
+from .atlas import build_atlas, TextureAtlas
+from .fonts import font_manager, FontManager, GameFont, resolve_font
+from .sprite_paths import GAME_BACKGROUND_PATH, ROBOTO_FONT_PATH
 from .game_button import GameButton
+from .glyphs import GLYPH_CHARSET, GlyphAtlas, glyph_renderer, GlyphRenderer, GlyphText
 from .load_sprite import load_sprite
+from .profiler_overlay import ProfilerOverlay
+from .renderer import choose_render_mode, DirtyRenderer, measure_render_modes
+from .scaled_cache import ScaledSpriteCache
+from .shapes import (
+    SHAPE_COLORS,
+    SHAPE_KINDS,
+    shape_renderer,
+    ShapeRenderer,
+    ShapeSpec,
+    ShapeWidget,
+)
+from .spatial_index import SpatialGrid
+from .sprite_cache import sprite_cache, SpriteCache
 from .text_box import TextBox
+from .text_cache import text_cache, TextCache
@@ -0,0 +1,281 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+import queue
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from pygame import image, mixer, Rect, transform
+from core.ui.fonts import font_manager
+from core.ui.scaled_cache import ScaledSpriteCache
+from core.ui.sprite_paths import GAME_BACKGROUND_PATH, ROBOTO_FONT_PATH
+from core.utils import logger
+
+
+@dataclass(frozen=True)
+class Asset:
+    """Manifest entry describing a file the game loads"""
+
+    name: str
+    path: str
+    # "sprite", "font" or "sound"
+    kind: str = "sprite"
+    # Assets of a group are preloaded together, usually one group per scene
+    group: str = "common"
+    # Sprites only: "world" scales with the screen, "screen" additionally
+    # crops to the screen size, "none" keeps the original size
+    scale: str = "world"
+    alpha: bool = False
+    # Fonts only: size in points on a 640x480 screen
+    size: int = 12
+
+
+DEFAULT_ASSETS = (
+    Asset("background", GAME_BACKGROUND_PATH, scale="screen"),
+    Asset("font", ROBOTO_FONT_PATH, kind="font"),
+)
+
+
+class AssetRegistry:
+    """Maps logical asset names to files and loads them ahead of time.
+
+    ``preload`` reads and decodes a group of assets on a worker thread.
+    Everything that needs the display or SDL_ttf, like ``convert()`` and
+    creating fonts, happens on the main thread in ``finalize_pending``, which
+    the game calls once per frame.
+    """
+
+    def __init__(
+        self,
+        scale_x: float = 1.0,
+        scale_y: float = 1.0,
+        screen_size: Optional[Tuple[int, int]] = None,
+        scaled_sprites: Optional[ScaledSpriteCache] = None,
+        assets: Iterable[Asset] = DEFAULT_ASSETS,
+    ) -> None:
+        """Create a registry
+
+        Args:
+            scale_x (float): X scaling factor of the world. Defaults to 1.0.
+            scale_y (float): Y scaling factor of the world. Defaults to 1.0.
+            screen_size (Optional[Tuple[int, int]]): Screen size, used by the\
+                "screen" scale policy.
+            scaled_sprites (Optional[ScaledSpriteCache]): On-disk cache for\
+                sprites scaled with the "screen" policy.
+            assets (Iterable[Asset]): Initial manifest.
+        """
+
+        self.scale_x = scale_x
+        self.scale_y = scale_y
+        self.screen_size = screen_size
+        self.scaled_sprites = scaled_sprites
+
+        self._assets: Dict[str, Asset] = {}
+        self._loaded: Dict[str, Any] = {}
+        self._pending: Dict[str, Future] = {}
+        # Assets that failed to preload, get() loads them again on demand
+        self._failed: Set[str] = set()
+        self._decoded = queue.Queue()
+        self._executor = None
+
+        for asset in assets:
+            self.register(asset)
+
+    def register(self, asset: Asset) -> None:
+        """Add an asset to the manifest, replacing one of the same name"""
+
+        self._assets[asset.name] = asset
+        self._loaded.pop(asset.name, None)
+        self._failed.discard(asset.name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._assets
+
+    def info(self, name: str) -> Asset:
+        """Return the manifest entry of an asset"""
+
+        return self._assets[name]
+
+    def group(self, group: str) -> Tuple[str, ...]:
+        """Return the names of every asset in a group"""
+
+        return tuple(
+            name for name, asset in self._assets.items() if asset.group == group
+        )
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._loaded
+
+    def is_ready(self, group: str) -> bool:
+        """Whether every asset of a group can be fetched without blocking,\
+        assets that failed to preload included"""
+
+        return all(
+            name in self._loaded or name in self._failed for name in self.group(group)
+        )
+
+    def _decode(self, asset: Asset) -> Any:
+        """Do the file I/O and decoding of an asset. Safe off the main thread."""
+
+        if asset.kind == "sprite":
+            if asset.scale == "screen" and self.scaled_sprites:
+                return self.scaled_sprites.load(
+                    asset.path,
+                    transparent=asset.alpha,
+                    scale_x=self.scale_x,
+                    scale_y=self.scale_y,
+                    crop=self.screen_size,
+                    convert=False,
+                )
+
+            sprite = image.load(asset.path)
+            if asset.scale != "none":
+                width, height = sprite.get_size()
+                sprite = transform.scale(
+                    sprite, (int(width * self.scale_x), int(height * self.scale_y))
+                )
+            if asset.scale == "screen" and self.screen_size:
+                sprite = sprite.subsurface(
+                    sprite.get_rect().clip(Rect((0, 0), self.screen_size))
+                ).copy()
+            return sprite
+
+        # Fonts and sounds are read into memory, SDL objects are made later
+        with open(asset.path, "rb") as asset_file:
+            return asset_file.read()
+
+    def _finalize(self, asset: Asset, decoded: Any) -> Any:
+        """Turn decoded data into the final object. Main thread only."""
+
+        if asset.kind == "sprite":
+            return decoded.convert_alpha() if asset.alpha else decoded.convert()
+        if asset.kind == "font":
+            font_manager.add_data(asset.path, decoded)
+            return font_manager.get(asset.path, asset.size)
+        if asset.kind == "sound":
+            return mixer.Sound(buffer=decoded) if mixer.get_init() else None
+        raise ValueError(f"Unknown asset kind {asset.kind} of {asset.name}")
+
+    def _decode_in_background(self, name: str) -> None:
+        asset = self._assets[name]
+        try:
+            decoded = self._decode(asset)
+        except Exception:
+            # Reported on the main thread, the worker keeps going
+            logger.warning(f"Unable to preload asset {name}.", exc_info=True)
+            decoded = None
+        self._decoded.put((name, decoded))
+
+    def preload(self, *groups: str) -> None:
+        """Start loading asset groups on the worker thread
+
+        Args:
+            groups (str): Names of the groups.
+        """
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="asset-preload"
+            )
+
+        for group in groups:
+            for name in self.group(group):
+                if (
+                    name not in self._loaded
+                    and name not in self._pending
+                    and name not in self._failed
+                ):
+                    self._pending[name] = self._executor.submit(
+                        self._decode_in_background, name
+                    )
+
+    def finalize_pending(self) -> int:
+        """Finish assets the worker thread has decoded. Main thread only.
+
+        Returns:
+            int: Number of assets that became available.
+        """
+
+        count = 0
+        while True:
+            try:
+                name, decoded = self._decoded.get_nowait()
+            except queue.Empty:
+                return count
+
+            self._pending.pop(name, None)
+            if name not in self._assets:
+                continue
+            if decoded is None:
+                self._failed.add(name)
+                continue
+            try:
+                self._loaded[name] = self._finalize(self._assets[name], decoded)
+            except Exception:
+                logger.warning(f"Unable to preload asset {name}.", exc_info=True)
+                self._failed.add(name)
+                continue
+            count += 1
+
+    def get(self, name: str) -> Any:
+        """Return a loaded asset, loading it now if it was not preloaded
+
+        Args:
+            name (str): Logical name of the asset.
+
+        Returns:
+            Any: Surface for sprites, Font for fonts, Sound for sounds.\
+                Fonts come from and are shared with font_manager.
+        """
+
+        if name in self._loaded:
+            return self._loaded[name]
+
+        pending = self._pending.get(name)
+        if pending:
+            logger.debug(f"Waiting for preloaded asset {name}")
+            pending.result()
+            self.finalize_pending()
+            if name in self._loaded:
+                return self._loaded[name]
+
+        logger.debug(f"Loading asset {name} on demand")
+        asset = self._assets[name]
+        # Raises the error again if the asset failed to preload
+        self._loaded[name] = self._finalize(asset, self._decode(asset))
+        self._failed.discard(name)
+        return self._loaded[name]
+
+    def unload(self, group: str) -> None:
+        """Drop loaded assets of a group to free memory"""
+
+        for name in self.group(group):
+            self._loaded.pop(name, None)
+            self._failed.discard(name)
+
+    def shutdown(self) -> None:
+        """Stop the worker thread"""
+
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
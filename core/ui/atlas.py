@@ -0,0 +1,236 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""Pack many small sprites into a few sheets and hand them out by name.
+
+Build the atlas once, before bundling::
+
+    python -m core.ui.atlas sprites/ atlases/
+
+and load it at runtime with ``TextureAtlas("atlases/sprites.json")``.
+"""
+
+import argparse
+import json
+import os
+from typing import Dict, List, Optional, SupportsFloat, Tuple
+
+from pygame import error, image, Rect, Surface, SRCALPHA
+
+from core.ui.load_sprite import load_sprite
+from core.utils import logger
+
+SPRITE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".tga")
+
+
+def _find_sprites(sprite_dir: str) -> Dict[str, str]:
+    """Map sprite names (relative paths without extension) to file paths"""
+
+    sprites = {}
+    for root, _, files in os.walk(sprite_dir):
+        for file_name in sorted(files):
+            if file_name.lower().endswith(SPRITE_EXTENSIONS):
+                path = os.path.join(root, file_name)
+                name = os.path.splitext(os.path.relpath(path, sprite_dir))[0]
+                sprites[name.replace(os.sep, "/")] = path
+    return sprites
+
+
+def _pack(
+    sizes: Dict[str, Tuple[int, int]], max_size: int, padding: int
+) -> List[Dict[str, Rect]]:
+    """Place rects on shelves, tallest first, opening a new sheet when full"""
+
+    sheets: List[Dict[str, Rect]] = []
+    sheet = None
+    for name in sorted(sizes, key=lambda name: (-sizes[name][1], name)):
+        width, height = sizes[name]
+        if width > max_size or height > max_size:
+            # Too big to share a sheet, it gets one of its own
+            sheets.append({name: Rect(0, 0, width, height)})
+            continue
+
+        if sheet is None or shelf_x + width > max_size:
+            if sheet is not None and shelf_y + shelf_height + padding + height <= max_size:
+                shelf_y += shelf_height + padding
+            else:
+                sheet = {}
+                sheets.append(sheet)
+                shelf_y = 0
+            shelf_x, shelf_height = 0, height
+
+        sheet[name] = Rect(shelf_x, shelf_y, width, height)
+        shelf_x += width + padding
+
+    return sheets
+
+
+def build_atlas(
+    sprite_dir: str,
+    output_dir: str,
+    name: str = "sprites",
+    max_size: int = 2048,
+    padding: int = 2,
+) -> str:
+    """Pack every sprite of a directory into sheets and write a manifest
+
+    Args:
+        sprite_dir (str): Directory searched recursively for sprites.
+        output_dir (str): Directory the sheets and manifest are written to.
+        name (str): Base name of the output files. Defaults to "sprites".
+        max_size (int): Maximum width and height of a sheet. Defaults to 2048.
+        padding (int): Empty pixels between sprites, so scaled sprites do\
+            not bleed into each other. Defaults to 2.
+
+    Returns:
+        str: Path of the manifest.
+    """
+
+    images = {}
+    for sprite_name, path in _find_sprites(sprite_dir).items():
+        try:
+            images[sprite_name] = image.load(path)
+        except error:
+            logger.warning(f"Skipping sprite {path}, it could not be loaded.")
+
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = {"sheets": [], "sprites": {}}
+    sizes = {sprite_name: sprite.get_size() for sprite_name, sprite in images.items()}
+
+    for index, placements in enumerate(_pack(sizes, max_size, padding)):
+        width = max(rect.right for rect in placements.values())
+        height = max(rect.bottom for rect in placements.values())
+        sheet = Surface((width, height), SRCALPHA)
+        for sprite_name, rect in placements.items():
+            sheet.blit(images[sprite_name], rect)
+            manifest["sprites"][sprite_name] = {"sheet": index, "rect": list(rect)}
+
+        sheet_file = f"{name}-{index}.png"
+        image.save(sheet, os.path.join(output_dir, sheet_file))
+        manifest["sheets"].append(sheet_file)
+
+    manifest_path = os.path.join(output_dir, f"{name}.json")
+    with open(manifest_path, "w") as manifest_file:
+        json.dump(manifest, manifest_file, indent=1, sort_keys=True)
+
+    logger.info(
+        f"Packed {len(images)} sprites into {len(manifest['sheets'])} sheets"
+    )
+    return manifest_path
+
+
+class TextureAtlas:
+    """Runtime loader handing out atlas sprites as subsurfaces.
+
+    Each sheet is decoded and scaled once, every sprite on it is a subsurface
+    sharing the sheet's pixels.
+    """
+
+    def __init__(
+        self,
+        manifest_path: str,
+        scale_x: Optional[SupportsFloat] = None,
+        scale_y: Optional[SupportsFloat] = None,
+        transparent: bool = True,
+    ) -> None:
+        """Load an atlas
+
+        Args:
+            manifest_path (str): Manifest written by build_atlas.
+            scale_x (Optional[SupportsFloat]): X scaling factor. Defaults to 1.0.
+            scale_y (Optional[SupportsFloat]): Y scaling factor. Defaults to 1.0.
+            transparent (bool): Keep per-pixel alpha. Defaults to True.
+        """
+
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+
+        self.scale_x = float(scale_x or 1.0)
+        self.scale_y = float(scale_y or 1.0)
+
+        directory = os.path.dirname(manifest_path)
+        self.sheets = [
+            load_sprite(
+                os.path.join(directory, sheet_file),
+                transparent=transparent,
+                scale_x=self.scale_x,
+                scale_y=self.scale_y,
+            )
+            for sheet_file in manifest["sheets"]
+        ]
+        self._entries = manifest["sprites"]
+        self._sprites: Dict[str, Surface] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def names(self) -> List[str]:
+        """Return the names of every sprite in the atlas"""
+
+        return sorted(self._entries)
+
+    def get(self, name: str) -> Surface:
+        """Return a sprite by name
+
+        Args:
+            name (str): Sprite path relative to the packed directory,\
+                without extension, e.g. "shapes/circle".
+
+        Returns:
+            Surface: Subsurface of the sheet. Must not be drawn on.
+        """
+
+        sprite = self._sprites.get(name)
+        if sprite is None:
+            entry = self._entries[name]
+            sheet = self.sheets[entry["sheet"]]
+            x, y, width, height = entry["rect"]
+            left, top = round(x * self.scale_x), round(y * self.scale_y)
+            rect = Rect(
+                left,
+                top,
+                round((x + width) * self.scale_x) - left,
+                round((y + height) * self.scale_y) - top,
+            ).clip(sheet.get_rect())
+            sprite = self._sprites[name] = sheet.subsurface(rect)
+        return sprite
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pack sprites into an atlas.")
+    parser.add_argument("sprite_dir", help="directory with the sprites")
+    parser.add_argument("output_dir", help="directory for the sheets and manifest")
+    parser.add_argument("--name", default="sprites", help="base name of the output")
+    parser.add_argument(
+        "--max-size", type=int, default=2048, help="maximum sheet size in pixels"
+    )
+    parser.add_argument("--padding", type=int, default=2, help="pixels between sprites")
+    args = parser.parse_args()
+    print(
+        build_atlas(
+            args.sprite_dir, args.output_dir, args.name, args.max_size, args.padding
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -21,12 +21,127 @@
 # SOFTWARE.
 
 from enum import Enum
+from io import BytesIO
+from typing import Dict, Optional, Tuple, Union
 
-from pygame.font import SysFont
+from pygame.font import Font
+
+from core.ui.sprite_paths import ROBOTO_FONT_PATH
+from core.utils import logger
 
 
 class GameFont(Enum):
-    """Store pygame Font instances used throughout the game."""
+    """Font faces bundled with the game"""
+
+    ROBOTO = ROBOTO_FONT_PATH
+
+
+class FontManager:
+    """Loads each font face and size exactly once and shares the Font objects.
+
+    Sizes are given in points on a 640x480 screen and scaled with the screen.
+    """
+
+    DEFAULT_SIZE = 12
+
+    def __init__(self, scale: float = 1.0) -> None:
+        """Create a font manager
+
+        Args:
+            scale (float): Factor applied to every point size. Defaults to 1.0.
+        """
+
+        self.scale = scale
+        self._data: Dict[str, bytes] = {}
+        self._fonts: Dict[Tuple[str, int], Font] = {}
+
+    @staticmethod
+    def _path(face: Union[GameFont, str]) -> str:
+        return face.value if isinstance(face, GameFont) else face
+
+    def set_scale(self, scale: float) -> None:
+        """Change the size scale, dropping fonts created at the old scale
+
+        Args:
+            scale (float): Factor applied to every point size.
+        """
+
+        if scale != self.scale:
+            self.scale = scale
+            self._fonts.clear()
+
+    def add_data(self, face: Union[GameFont, str], data: bytes) -> None:
+        """Provide the contents of a font file read elsewhere, e.g. on the
+        asset worker thread, so it is not read again
+
+        Args:
+            face (Union[GameFont, str]): Font face or path of the font file.
+            data (bytes): Contents of the file.
+        """
+
+        self._data.setdefault(self._path(face), data)
+
+    def scaled_size(self, size: int) -> int:
+        """Return the pixel size a point size is rendered at"""
+
+        return max(1, int(size * self.scale))
+
+    def get(
+        self, face: Union[GameFont, str] = GameFont.ROBOTO, size: Optional[int] = None
+    ) -> Font:
+        """Return the shared Font for a face and size, loading it on first use
+
+        Args:
+            face (Union[GameFont, str]): Font face or path of a font file.\
+                Defaults to Roboto.
+            size (Optional[int]): Size in points on a 640x480 screen.\
+                Defaults to DEFAULT_SIZE.
+
+        Returns:
+            Font: The font.
+        """
+
+        path = self._path(face)
+        key = (path, self.scaled_size(size or self.DEFAULT_SIZE))
+        font = self._fonts.get(key)
+        if font is None:
+            data = self._data.get(path)
+            if data is None:
+                with open(path, "rb") as font_file:
+                    data = self._data[path] = font_file.read()
+            logger.debug(f"Loading font {path} at {key[1]}px")
+            font = self._fonts[key] = Font(BytesIO(data), key[1])
+        return font
+
+    def prewarm(self, *sizes: int, face: Union[GameFont, str] = GameFont.ROBOTO) -> None:
+        """Load fonts a scene is about to need
+
+        Args:
+            sizes (int): Sizes in points on a 640x480 screen.
+            face (Union[GameFont, str]): Font face. Defaults to Roboto.
+        """
+
+        for size in sizes:
+            self.get(face, size)
+
+
+def resolve_font(font: Optional[Union[Font, GameFont]]) -> Font:
+    """Return a Font for what widgets accept as font argument
+
+    Args:
+        font (Optional[Union[Font, GameFont]]): A Font, a face at the default\
+            size, or None for the default face and size.
+
+    Returns:
+        Font: The font.
+    """
+
+    if font is None:
+        return font_manager.get()
+    if isinstance(font, GameFont):
+        return font_manager.get(font)
+    return font
+
 
-    # TIMES_NEW_ROMAN_12PT = SysFont("Times New Roman", 12)
-    pass
+# Shared by every widget
+font_manager = FontManager()
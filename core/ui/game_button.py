@@ -20,19 +20,37 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from typing import Optional, SupportsFloat, Union
+from typing import Optional, SupportsFloat, Tuple, Union
 
 from pygame import error, Surface, mouse
 from pygame.font import Font
 from pygame.color import Color
 
 
-from core.ui.fonts import GameFont
+from core.ui.fonts import GameFont, resolve_font
+from core.ui.text_cache import text_cache
 from core.utils import logger
 
 
 class GameButton:
-    """Class for creating game buttons"""
+    """Class for creating game buttons
+
+    Every visual state is rendered once at construction, changing state only
+    swaps which surface is shown.
+    """
+
+    NORMAL = "normal"
+    HOVER = "hover"
+    PRESSED = "pressed"
+    DISABLED = "disabled"
+
+    # (text color, background color), None means the button's own colors
+    STATE_COLORS = {
+        NORMAL: (None, None),
+        HOVER: ((122, 245, 61), (102, 110, 98)),
+        PRESSED: ((255, 255, 255), (62, 70, 58)),
+        DISABLED: ((150, 150, 150), None),
+    }
 
     def __init__(
         self,
@@ -42,6 +60,7 @@ class GameButton:
         font: Optional[Union[Font, GameFont]] = None,
         color: Optional[Union[Color, str, int]] = None,
         background_color: Optional[Union[Color, str, int]] = None,
+        enabled: bool = True,
         **kwargs,
     ) -> None:
         """Instantiate a button
@@ -51,49 +70,112 @@ class GameButton:
             x (SupportsFloat): X coordinate of button.
             y (SupportsFloat): Y coordinate of button.
             font (Optional[Font]): Font for rendering the text.
+            color (Optional[Color]): Text color. Defaults to blue.
+            background_color (Optional[Color]): Background color.\
+                Transparent by default.
+            enabled (bool): Whether the button reacts to the pointer.\
+                Defaults to True.
         """
 
         self.label = label
-        self.font = font or GameFont.TIMES_NEW_ROMAN_12PT
+        self.font = resolve_font(font)
         self.color = color
         self.background_color = background_color
 
         # Render Button
-        try:
-            self.button = self.font.render(
-                label,
-                True,
-                ((0, 0, 255) or self.color),
-                self.background_color,
-            )
-        except error as button_rendering_error:
-            logger.error(f"Failed to render button for {label}. ", exc_info=True)
-            self.button = Surface()
+        self.states = {}
+        for state, (state_color, state_background) in self.STATE_COLORS.items():
+            try:
+                self.states[state] = text_cache.render(
+                    self.font,
+                    label,
+                    True,
+                    state_color or self.color or (0, 0, 255),
+                    state_background or self.background_color,
+                )
+            except error as button_rendering_error:
+                logger.error(f"Failed to render button for {label}. ", exc_info=True)
+                self.states[state] = Surface((1, 1))
+
+        self.state = self.NORMAL if enabled else self.DISABLED
+        self.button = self.states[self.state]
 
         self.rect = self.button.get_rect()
         self.rect.x, self.rect.y = x, y
 
         self.hovered = False
+        self.pressed = False
+        self.dirty = True
 
-    def check_mouse_hover(self) -> bool:
-        """Checks whether mouse is hovering over button\
-        and updates its hover state accordingly"""
-        if self.rect.collidepoint(mouse.get_pos()):
-            if not self.hovered:
-                self.hovered = True
-                self.button = self.font.render(
-                    self.label,
-                    True,
-                    (122, 245, 61),
-                    (102, 110, 98),
-                )
-                return True
+    @property
+    def surface(self) -> Surface:
+        """Surface currently shown for the button"""
+
+        return self.button
+
+    @property
+    def enabled(self) -> bool:
+        return self.state != self.DISABLED
+
+    @enabled.setter
+    def enabled(self, enabled: bool) -> None:
+        if not enabled:
+            self.hovered = self.pressed = False
+        self._update_state(enabled)
+
+    def _update_state(self, enabled: Optional[bool] = None) -> None:
+        """Show the surface matching the current flags"""
+
+        if not (self.enabled if enabled is None else enabled):
+            state = self.DISABLED
+        elif self.pressed:
+            state = self.PRESSED
+        elif self.hovered:
+            state = self.HOVER
         else:
-            self.hovered = False
-            self.object = self.font.render(
-                self.label,
-                True,
-                ((0, 0, 255) or self.color),
-                self.background_color,
-            )
-            return False
+            state = self.NORMAL
+
+        if state != self.state:
+            self.state = state
+            self.button = self.states[state]
+            self.dirty = True
+
+    def check_mouse_hover(self, pos: Optional[Tuple[int, int]] = None) -> bool:
+        """Checks whether mouse is hovering over button\
+        and updates its hover state accordingly
+
+        Args:
+            pos (Optional[Tuple[int, int]]): Pointer position. Read from\
+                the mouse by default.
+
+        Returns:
+            bool: Whether the button is hovered.
+        """
+        if pos is None:
+            pos = mouse.get_pos()
+
+        self.hovered = self.enabled and bool(self.rect.collidepoint(pos))
+        if not self.hovered:
+            # Dragging off the button cancels the press
+            self.pressed = False
+        self._update_state()
+        return self.hovered
+
+    def press(self) -> None:
+        """Show the button as pressed"""
+
+        if self.enabled:
+            self.pressed = True
+            self._update_state()
+
+    def release(self) -> bool:
+        """Stop showing the button as pressed
+
+        Returns:
+            bool: Whether the button was pressed, i.e. the release completes a click.
+        """
+
+        was_pressed = self.pressed
+        self.pressed = False
+        self._update_state()
+        return was_pressed
@@ -0,0 +1,353 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from typing import Dict, List, Optional, SupportsFloat, Tuple, Union
+
+from pygame import BLEND_RGBA_MAX, BLEND_RGBA_MIN, Rect, Surface, SRCALPHA
+from pygame.font import Font
+
+from core.ui.fonts import GameFont, resolve_font
+from core.ui.text_cache import _color_key, ColorValue, text_cache
+
+# Characters of numbers, equations, scores and timers
+GLYPH_CHARSET = "0123456789+-−×÷=?.,:/%() "
+
+
+class GlyphAtlas:
+    """Every glyph of a small character set rendered once onto one sheet.
+
+    Text made only of these characters is composed by blitting glyphs from
+    the sheet, with the font's kerning applied between each pair, instead of
+    rendering it through the font.
+    """
+
+    def __init__(
+        self,
+        font: Font,
+        color: ColorValue = (0, 0, 0),
+        antialias: bool = True,
+        charset: str = GLYPH_CHARSET,
+    ) -> None:
+        """Render the glyphs of a character set
+
+        Args:
+            font (Font): Font for rendering the glyphs.
+            color (ColorValue): Glyph color. Defaults to black.
+            antialias (bool): Smooth the glyph edges. Defaults to True.
+            charset (str): Characters in the atlas. Defaults to GLYPH_CHARSET.
+        """
+
+        self.color = _color_key(color)
+        self.height = font.get_height()
+
+        glyphs = {char: font.render(char, antialias, color) for char in charset}
+        self.sheet = Surface(
+            (sum(glyph.get_width() for glyph in glyphs.values()) or 1, self.height),
+            SRCALPHA,
+        )
+        self.sheet.fill((*self.color[:3], 0))
+
+        self.rects: Dict[str, Rect] = {}
+        self.advances: Dict[str, int] = {}
+        x = 0
+        for char, glyph in glyphs.items():
+            self.sheet.blit(glyph, (x, 0))
+            self.rects[char] = Rect(x, 0, glyph.get_width(), self.height)
+            self.advances[char] = font.size(char)[0]
+            x += glyph.get_width()
+
+        # Only pairs the font moves closer together or further apart
+        self.kerning: Dict[Tuple[str, str], int] = {}
+        for first in charset:
+            for second in charset:
+                adjustment = (
+                    font.size(first + second)[0]
+                    - self.advances[first]
+                    - self.advances[second]
+                )
+                if adjustment:
+                    self.kerning[(first, second)] = adjustment
+
+        kerned = {char for pair in self.kerning for char in pair}
+        self._overhanging = {
+            char for char, rect in self.rects.items() if rect.width > self.advances[char]
+        }
+        # Glyphs that never overlap a neighbour and can be swapped in place
+        self._isolated = set(self.rects) - kerned - self._overhanging
+
+        # Clears a glyph's area, a blit is much cheaper than a fill on
+        # surfaces with per pixel alpha
+        self._eraser = Surface(
+            (max((rect.width for rect in self.rects.values()), default=1), self.height),
+            SRCALPHA,
+        )
+
+    def supports(self, text: str) -> bool:
+        """Return whether every character of the text is in the atlas"""
+
+        return all(char in self.rects for char in text)
+
+    def _positions(self, text: str) -> List[Tuple[str, int]]:
+        """X offset of each character of the text"""
+
+        positions = []
+        x = 0
+        previous = None
+        advances, kerning = self.advances, self.kerning
+        for char in text:
+            if previous is not None:
+                x += advances[previous] + kerning.get((previous, char), 0)
+            positions.append((char, x))
+            previous = char
+        return positions
+
+    def size(self, text: str) -> Tuple[int, int]:
+        """Return the size of the text when composed
+
+        Args:
+            text (str): Text made of atlas characters.
+
+        Returns:
+            Tuple[int, int]: Width and height in pixels.
+        """
+
+        return self._size(self._positions(text))
+
+    def _size(self, positions: List[Tuple[str, int]]) -> Tuple[int, int]:
+        rects = self.rects
+        width = max((x + rects[char].width for char, x in positions), default=0)
+        return width, self.height
+
+    def blit(self, dest: Surface, text: str, pos: Tuple[int, int]) -> None:
+        """Compose text onto a surface
+
+        Args:
+            dest (Surface): Surface to draw on.
+            text (str): Text made of atlas characters.
+            pos (Tuple[int, int]): Top left corner of the text.
+        """
+
+        # Overlapping glyph boxes keep the strongest coverage of either glyph
+        # on transparent surfaces, and blend normally over opaque ones
+        flags = BLEND_RGBA_MAX if dest.get_flags() & SRCALPHA else 0
+        sheet, rects = self.sheet, self.rects
+        left, top = pos
+        dest.blits(
+            [
+                (sheet, (left + x, top), rects[char], flags)
+                for char, x in self._positions(text)
+            ],
+            False,
+        )
+
+    def render(
+        self, text: str, background: Optional[ColorValue] = None
+    ) -> Surface:
+        """Compose text onto a new surface
+
+        Args:
+            text (str): Text made of atlas characters.
+            background (Optional[ColorValue]): Background color.\
+                Transparent by default.
+
+        Returns:
+            Surface: The text.
+        """
+
+        width, height = self.size(text)
+        if background is None:
+            # Starts fully transparent, the glyphs bring their own color
+            surface = Surface((max(width, 1), height), SRCALPHA)
+        else:
+            surface = Surface((max(width, 1), height))
+            surface.fill(background)
+        self.blit(surface, text, (0, 0))
+        return surface
+
+    def update(self, dest: Surface, old_text: str, text: str) -> bool:
+        """Redraw only the glyphs that changed on a transparent surface\
+        composed from this atlas, e.g. the last digit of a counter
+
+        Args:
+            dest (Surface): Transparent surface showing old_text.
+            old_text (str): Text currently on the surface.
+            text (str): New text.
+
+        Returns:
+            bool: False when the new text has a different layout and\
+                needs a new surface.
+        """
+
+        if len(text) != len(old_text):
+            return False
+
+        rects, advances, kerning = self.rects, self.advances, self.kerning
+        # Glyph boxes of the same size at the same place that touch no other box
+        changes = []
+        x = 0
+        previous = None
+        for old, new in zip(old_text, text):
+            if previous is not None:
+                x += advances[previous] + kerning.get((previous, old), 0)
+            if old != new:
+                if (
+                    new not in rects
+                    or advances[old] != advances[new]
+                    or rects[old].width != rects[new].width
+                    or not self._isolated.issuperset((old, new))
+                    or previous in self._overhanging
+                ):
+                    return False
+                changes.append((new, x))
+            previous = old
+
+        for char, x in changes:
+            area = Rect(x, 0, rects[char].width, self.height)
+            dest.blit(self._eraser, area, ((0, 0), area.size), BLEND_RGBA_MIN)
+            dest.blit(self.sheet, area, rects[char], BLEND_RGBA_MAX)
+        return True
+
+
+class GlyphRenderer:
+    """Shares one glyph atlas per font, color and antialiasing"""
+
+    def __init__(self, charset: str = GLYPH_CHARSET) -> None:
+        """Create a renderer without atlases
+
+        Args:
+            charset (str): Characters of every atlas. Defaults to GLYPH_CHARSET.
+        """
+
+        self.charset = charset
+        self._atlases: Dict[tuple, GlyphAtlas] = {}
+
+    def atlas(
+        self, font: Font, color: ColorValue = (0, 0, 0), antialias: bool = True
+    ) -> GlyphAtlas:
+        """Return the atlas for a font and color, building it on first use
+
+        Args:
+            font (Font): Font of the glyphs.
+            color (ColorValue): Glyph color. Defaults to black.
+            antialias (bool): Smooth the glyph edges. Defaults to True.
+
+        Returns:
+            GlyphAtlas: The atlas.
+        """
+
+        key = (font, _color_key(color), bool(antialias))
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            atlas = self._atlases[key] = GlyphAtlas(
+                font, color, antialias, self.charset
+            )
+        return atlas
+
+    def clear(self) -> None:
+        """Drop every atlas, e.g. after the fonts were replaced"""
+
+        self._atlases.clear()
+
+
+class GlyphText:
+    """Text widget for numbers that change often, e.g. scores and timers.
+
+    Text made of atlas glyphs is composed from the atlas, so a change that
+    keeps the layout, like the next second of a timer, redraws only the
+    changed glyphs in place. Other changes render through the text cache.
+    """
+
+    def __init__(
+        self,
+        text: str,
+        x: SupportsFloat,
+        y: SupportsFloat,
+        font: Optional[Union[Font, GameFont]] = None,
+        color: Optional[ColorValue] = None,
+        background_color: Optional[ColorValue] = None,
+        renderer: Optional[GlyphRenderer] = None,
+    ) -> None:
+        """Instantiate a glyph text
+
+        Args:
+            text (str): Initial text.
+            x (SupportsFloat): X coordinate of the text's centre.
+            y (SupportsFloat): Y coordinate of the text's top.
+            font (Optional[Font]): Font for rendering the text.
+            color (Optional[ColorValue]): Text color. Defaults to black.
+            background_color (Optional[ColorValue]): Background color.\
+                Transparent by default.
+            renderer (Optional[GlyphRenderer]): Renderer holding the atlases.\
+                Defaults to the shared glyph_renderer.
+        """
+
+        self.font = resolve_font(font)
+        self.color = color or (0, 0, 0)
+        self.background_color = background_color
+        self.renderer = renderer or glyph_renderer
+        self.atlas = self.renderer.atlas(self.font, self.color)
+        self.centre_x = x
+        self.text = None
+        # Whether the surface was composed for this widget and may be drawn on
+        self._composed = False
+        self.rect = Rect(x, y, 0, 0)
+        self.set_text(text)
+
+    @property
+    def surface(self) -> Surface:
+        """Surface currently shown for the text"""
+
+        return self.text_surface
+
+    def set_text(self, text: str) -> None:
+        """Change the text, doing nothing when it is unchanged
+
+        Args:
+            text (str): New text.
+        """
+
+        if text == self.text:
+            return
+
+        if self._composed and self.atlas.update(self.text_surface, self.text, text):
+            # Same layout, only the changed glyphs were redrawn in place
+            self.text = text
+            self.dirty = True
+            return
+
+        self.text = text
+        # Only a transparent surface of atlas glyphs can be edited in place
+        self._composed = self.background_color is None and self.atlas.supports(text)
+        if self._composed:
+            self.text_surface = self.atlas.render(text)
+        else:
+            # Whole strings render faster through the font than the atlas
+            self.text_surface = text_cache.render(
+                self.font, text, True, self.color, self.background_color
+            )
+        self.rect = Rect((0, self.rect.y), self.text_surface.get_size())
+        self.rect.centerx = self.centre_x
+        self.dirty = True
+
+
+# Shared by every widget
+glyph_renderer = GlyphRenderer()
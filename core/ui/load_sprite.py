@@ -21,10 +21,11 @@
 # SOFTWARE.
 
 from typing import Optional, SupportsFloat
-from os import PathLike
+from os import fspath, PathLike
 
 from pygame import error, image, Surface, transform
 
+from core.ui.sprite_cache import sprite_cache
 from core.utils import logger
 
 
@@ -34,6 +35,7 @@ def load_sprite(
     scale_sprite: Optional[bool] = True,
     scale_x: Optional[SupportsFloat] = None,
     scale_y: Optional[SupportsFloat] = None,
+    use_cache: Optional[bool] = True,
     **kwargs,
 ) -> Surface:
     """Load a sprite from given path, 
@@ -48,17 +50,25 @@ def load_sprite(
             Defaults to 1.0.
         scale_y (Optional[SupportsFloat]): Y scaling factor.\
             Defaults to 1.0.
+        use_cache (Optional[bool]): Share the surface through the sprite\
+            cache. Cached surfaces must not be drawn on. Defaults to True.
 
     Returns:
         Surface: Surface instance of the loaded sprite
     """
 
+    scale_x = scale_x or 1.0
+    scale_y = scale_y or 1.0
+    key = (fspath(sprite_path), bool(transparent), bool(scale_sprite), scale_x, scale_y)
+    if use_cache:
+        sprite = sprite_cache.get(key)
+        if sprite is not None:
+            return sprite
+
     try:
         sprite = image.load(sprite_path)
         if scale_sprite:
             sx, sy = sprite.get_rect().size
-            scale_x = scale_x or 1.0
-            scale_y = scale_y or 1.0
             sprite = transform.scale(sprite, (int(sx * scale_x), int(sy * scale_y)))
 
     except error as sprite_loading_exception:
@@ -66,7 +76,10 @@ def load_sprite(
             "Unable to load sprite. Loading default surface.",
             exc_info=True,
         )
-        sprite = Surface()
+        # Not cached, so the next call tries again
+        return Surface((1, 1))
 
-    sprite = sprite.convert()
+    sprite = sprite.convert_alpha() if transparent else sprite.convert()
+    if use_cache:
+        sprite_cache.put(key, sprite)
     return sprite
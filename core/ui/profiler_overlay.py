@@ -0,0 +1,90 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from pygame import Rect, Surface, SRCALPHA
+from pygame.font import Font
+
+from core.utils.profiler import FrameProfiler
+
+
+class ProfilerOverlay:
+    """Widget showing FPS, frame time percentiles and the per-phase breakdown"""
+
+    COLOR = (255, 255, 255)
+    BACKGROUND_COLOR = (0, 0, 0, 160)
+
+    def __init__(
+        self,
+        profiler: FrameProfiler,
+        font: Font,
+        refresh_frames: int = 15,
+    ) -> None:
+        """Create the overlay in the top left corner of the screen
+
+        Args:
+            profiler (FrameProfiler): Profiler whose numbers are shown.
+            font (Font): Font for rendering the text.
+            refresh_frames (int): Frames between two refreshes of the text.\
+                Defaults to 15.
+        """
+
+        self.profiler = profiler
+        self.font = font
+        self.refresh_frames = refresh_frames
+        self._frames_left = 0
+
+        self.surface = Surface((1, 1), SRCALPHA)
+        self.rect = Rect(0, 0, 1, 1)
+        self.dirty = True
+
+    def _lines(self):
+        summary = self.profiler.summary()
+        frame_time = "  ".join(
+            f"{name} {value * 1000:.1f}" for name, value in summary["frame_time"].items()
+        )
+        phases = "  ".join(
+            f"{name} {value * 1000:.2f}" for name, value in summary["phases"].items()
+        )
+        return [f"FPS {summary['fps']:.1f}  frame ms {frame_time}", f"ms {phases}"]
+
+    def refresh(self) -> None:
+        """Re-render the text every refresh_frames calls"""
+
+        if self._frames_left > 0:
+            self._frames_left -= 1
+            return
+        self._frames_left = self.refresh_frames
+
+        # Not through the text cache, the numbers change on every refresh
+        lines = [self.font.render(line, True, self.COLOR) for line in self._lines()]
+        width = max(line.get_width() for line in lines) + 8
+        height = sum(line.get_height() for line in lines) + 8
+
+        self.surface = Surface((width, height), SRCALPHA)
+        self.surface.fill(self.BACKGROUND_COLOR)
+        y = 4
+        for line in lines:
+            self.surface.blit(line, (4, y))
+            y += line.get_height()
+
+        self.rect = self.surface.get_rect()
+        self.dirty = True
@@ -0,0 +1,362 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import math
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pygame import display, font, Rect, Surface, transform
+
+
+class DirtyRenderer:
+    """Redraws only the screen regions whose widgets changed.
+
+    Widgets are any object with a ``surface`` and a ``rect``; setting their
+    ``dirty`` flag or moving their rect schedules a redraw of the old and new
+    area. The background underneath is restored from a cached copy.
+    Overlays are drawn above the widgets and survive ``set_widgets``.
+
+    When given an output surface, the renderer draws on ``screen`` as an
+    off-screen logical canvas and scales it onto the output once per frame.
+    """
+
+    def __init__(
+        self,
+        screen: Surface,
+        background: Optional[Surface] = None,
+        output: Optional[Surface] = None,
+    ) -> None:
+        """Create a renderer for a screen
+
+        Args:
+            screen (Surface): Surface to draw on, the display itself unless\
+                an output is given.
+            background (Optional[Surface]): Surface shown behind all widgets.\
+                Black by default.
+            output (Optional[Surface]): Display surface the screen is scaled\
+                onto. None to draw on the display directly.
+        """
+
+        self.screen = screen
+        self.output = output
+        self.widgets = []
+        self.overlays = []
+        self._last_rects: Dict[object, Rect] = {}
+        self._dirty: List[Rect] = []
+        self._full_redraw = True
+        self.set_background(background)
+
+    def set_background(self, background: Optional[Surface]) -> None:
+        """Replace the background and schedule a full redraw
+
+        Args:
+            background (Optional[Surface]): New background surface.
+        """
+
+        self.background = background
+        self.invalidate()
+
+    def add(self, *widgets) -> None:
+        """Add widgets on top of the ones already drawn"""
+
+        for widget in widgets:
+            self.widgets.append(widget)
+            widget.dirty = True
+
+    def remove(self, *widgets) -> None:
+        """Remove widgets and restore the background underneath them"""
+
+        for widget in widgets:
+            self.widgets.remove(widget)
+            last_rect = self._last_rects.pop(widget, None)
+            if last_rect:
+                self._dirty.append(last_rect)
+
+    def set_widgets(self, widgets: Iterable) -> None:
+        """Replace every widget at once and schedule a full redraw
+
+        Args:
+            widgets (Iterable): Widgets in drawing order, bottom first.
+        """
+
+        self.widgets = list(widgets)
+        self._last_rects.clear()
+        self.invalidate()
+
+    def add_overlay(self, overlay) -> None:
+        """Add a widget drawn above every other widget"""
+
+        self.overlays.append(overlay)
+        overlay.dirty = True
+
+    def remove_overlay(self, overlay) -> None:
+        """Remove an overlay and restore what was underneath it"""
+
+        self.overlays.remove(overlay)
+        last_rect = self._last_rects.pop(overlay, None)
+        if last_rect:
+            self._dirty.append(last_rect)
+
+    def invalidate(self, rect: Optional[Rect] = None) -> None:
+        """Mark an area of the screen for redrawing
+
+        Args:
+            rect (Optional[Rect]): Area to redraw. The whole screen by default.
+        """
+
+        if rect is None:
+            self._full_redraw = True
+        else:
+            self._dirty.append(Rect(rect))
+
+    def _collect_dirty(self) -> List[Rect]:
+        """Gather dirty areas of every changed or moved widget"""
+
+        for widget in (*self.widgets, *self.overlays):
+            last_rect = self._last_rects.get(widget)
+            if widget.dirty or last_rect != widget.rect:
+                if last_rect:
+                    self._dirty.append(last_rect)
+                self._dirty.append(widget.rect.copy())
+                self._last_rects[widget] = widget.rect.copy()
+                widget.dirty = False
+
+        rects = []
+        for rect in self._dirty:
+            # Merge overlapping areas so no pixel is drawn twice
+            index = rect.collidelist(rects)
+            while index != -1:
+                rect = rect.union(rects.pop(index))
+                index = rect.collidelist(rects)
+            rects.append(rect)
+
+        self._dirty.clear()
+        return rects
+
+    def _draw_area(self, area: Rect) -> None:
+        """Restore the background of an area and redraw widgets over it"""
+
+        if self.background:
+            self.screen.blit(self.background, area, area)
+        else:
+            self.screen.fill((0, 0, 0), area)
+
+        for widget in (*self.widgets, *self.overlays):
+            clipped = area.clip(widget.rect)
+            if clipped:
+                self.screen.blit(
+                    widget.surface,
+                    clipped,
+                    clipped.move(-widget.rect.x, -widget.rect.y),
+                )
+
+    def _scale_area(self, area: Rect) -> Rect:
+        """Scale one area of the screen onto the output
+
+        The area is widened to the nearest screen pixels that fall exactly on
+        output pixels, so it scales to the same pixels as the whole screen.
+
+        Args:
+            area (Rect): Area of the screen.
+
+        Returns:
+            Rect: Area of the output that was drawn.
+        """
+
+        screen_width, screen_height = self.screen.get_size()
+        output_width, output_height = self.output.get_size()
+        step_x = screen_width // math.gcd(screen_width, output_width)
+        step_y = screen_height // math.gcd(screen_height, output_height)
+        left = area.x // step_x * step_x
+        top = area.y // step_y * step_y
+        right = min(-(-area.right // step_x) * step_x, screen_width)
+        bottom = min(-(-area.bottom // step_y) * step_y, screen_height)
+
+        source = Rect(left, top, right - left, bottom - top)
+        # Exact, the edges of the source are whole output pixels
+        target_left = left * output_width // screen_width
+        target_top = top * output_height // screen_height
+        target = Rect(
+            target_left,
+            target_top,
+            right * output_width // screen_width - target_left,
+            bottom * output_height // screen_height - target_top,
+        )
+        transform.scale(
+            self.screen.subsurface(source),
+            target.size,
+            self.output.subsurface(target),
+        )
+        return target
+
+    def _present(self, rects: List[Rect], full: bool) -> None:
+        """Push drawn areas to the display"""
+
+        if self.output is not None:
+            # The single scale pass of the frame, over the changed area only
+            if full:
+                transform.scale(self.screen, self.output.get_size(), self.output)
+            else:
+                rects = [self._scale_area(rects[0].unionall(rects[1:]))]
+
+        if full:
+            display.flip()
+        else:
+            display.update(rects)
+
+    def render(self) -> List[Rect]:
+        """Redraw changed areas and push them to the display
+
+        Returns:
+            List[Rect]: Areas of the screen that were updated.
+        """
+
+        rects = self._collect_dirty()
+
+        if self._full_redraw:
+            self._full_redraw = False
+            rects = [self.screen.get_rect()]
+            self._draw_area(rects[0])
+            self._present(rects, True)
+            return rects
+
+        screen_rect = self.screen.get_rect()
+        rects = [rect.clip(screen_rect) for rect in rects]
+        rects = [rect for rect in rects if rect]
+        for rect in rects:
+            self._draw_area(rect)
+
+        if rects:
+            self._present(rects, False)
+        return rects
+
+
+def measure_render_modes(
+    output: Surface,
+    logical_size: Tuple[int, int],
+    sprites: Sequence[Surface] = (),
+    font_path: Optional[str] = None,
+    font_size: int = 12,
+    frames: int = 300,
+    repeat: int = 5,
+) -> Dict[str, float]:
+    """Time what differs between the render modes on the current display
+
+    "scaled" scales every sprite to the output once, then draws frames and
+    renders text at the output's native size. "logical" draws frames and
+    renders text at the logical size, then scales the frame to the output.
+
+    Args:
+        output (Surface): The display surface.
+        logical_size (Tuple[int, int]): Size of the logical canvas.
+        sprites (Sequence[Surface]): Sprites as loaded from disk, drawn at\
+            their scaled size in every frame. The first one covers the screen\
+            and stands in for a blank background if there are none.
+        font_path (Optional[str]): Font of the text drawn in every frame.\
+            Defaults to pygame's default font.
+        font_size (int): Size of the text in points on the logical canvas.\
+            Defaults to 12.
+        frames (int): Frames the one time sprite scaling is spread over.\
+            Defaults to 300.
+        repeat (int): Times each step is timed, the best one counts.\
+            Defaults to 5.
+
+    Returns:
+        Dict[str, float]: Seconds per frame for each mode.
+    """
+
+    def best_of(step: Callable[[], object]) -> float:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            step()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    sprites = list(sprites) or [Surface(logical_size)]
+    text = "12 × 7 = 84"
+    canvas = Surface(logical_size).convert()
+    scale_x = output.get_width() / logical_size[0]
+    scale_y = output.get_height() / logical_size[1]
+
+    def scale_sprites(scale_x: float, scale_y: float) -> List[Surface]:
+        return [
+            transform.scale(
+                sprite,
+                (
+                    max(int(sprite.get_width() * scale_x), 1),
+                    max(int(sprite.get_height() * scale_y), 1),
+                ),
+            ).convert()
+            for sprite in sprites
+        ]
+
+    def frame(
+        dest: Surface, scaled: List[Surface], text_font: font.Font
+    ) -> Callable[[], None]:
+        def draw() -> None:
+            dest.blits([(sprite, (0, 0)) for sprite in scaled], False)
+            dest.blit(text_font.render(text, True, (0, 0, 0)), (0, 0))
+
+        return draw
+
+    native_sprites = scale_sprites(scale_x, scale_y)
+    logical_sprites = scale_sprites(1.0, 1.0)
+    native_font = font.Font(font_path, max(int(font_size * scale_x), 1))
+    logical_font = font.Font(font_path, font_size)
+    draw_native = frame(output, native_sprites, native_font)
+    draw_logical = frame(canvas, logical_sprites, logical_font)
+
+    def draw_scaled_canvas() -> None:
+        draw_logical()
+        transform.scale(canvas, output.get_size(), output)
+
+    return {
+        "scaled": best_of(lambda: scale_sprites(scale_x, scale_y)) / frames
+        + best_of(draw_native),
+        "logical": best_of(lambda: scale_sprites(1.0, 1.0)) / frames
+        + best_of(draw_scaled_canvas),
+    }
+
+
+def choose_render_mode(
+    output: Surface,
+    logical_size: Tuple[int, int],
+    sprites: Sequence[Surface] = (),
+    font_path: Optional[str] = None,
+) -> str:
+    """Return the render mode with the cheaper frames on this display
+
+    Args:
+        output (Surface): The display surface.
+        logical_size (Tuple[int, int]): Size of the logical canvas.
+        sprites (Sequence[Surface]): Sprites as loaded from disk.
+        font_path (Optional[str]): Font of the game's text.
+
+    Returns:
+        str: "scaled" or "logical".
+    """
+
+    if output.get_size() == tuple(logical_size):
+        return "scaled"
+    timings = measure_render_modes(output, logical_size, sprites, font_path)
+    return min(timings, key=timings.get)
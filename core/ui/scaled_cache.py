@@ -0,0 +1,198 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import hashlib
+import mmap
+import os
+import struct
+from typing import Optional, SupportsFloat, Tuple
+
+from pygame import display, error, image, Rect, Surface, transform
+
+from core.utils import atomic_write, logger
+
+# Older pygame only has the deprecated names
+_tobytes = getattr(image, "tobytes", None) or image.tostring
+
+# magic, version, pixel format, width, height
+HEADER = struct.Struct("<4sH6sII")
+MAGIC = b"BMSC"
+VERSION = 1
+
+
+def _display_format(transparent: bool) -> str:
+    """Byte order matching the display surface, so convert() is a plain copy"""
+
+    screen = display.get_surface()
+    masks = screen.get_masks()[:3] if screen else ()
+    if masks == (0xFF0000, 0xFF00, 0xFF):
+        return "BGRA"
+    if masks == (0xFF, 0xFF00, 0xFF0000):
+        return "RGBA" if transparent else "RGBX"
+    return "RGBA"
+
+
+class ScaledSpriteCache:
+    """On-disk cache of scaled sprites as raw pixels in the display's format.
+
+    Entries are keyed by the hash of the source file and the requested
+    scaling, and read back through a memory map, skipping both the image
+    decode and the rescale of ``load_sprite``.
+    """
+
+    def __init__(self, cache_dir: str) -> None:
+        """Create a cache
+
+        Args:
+            cache_dir (str): Directory the cached pixels are stored in.
+        """
+
+        self.cache_dir = cache_dir
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+        except OSError:
+            logger.warning(f"Cannot create sprite cache in {cache_dir}.", exc_info=True)
+
+    def _entry_path(
+        self,
+        sprite_path: str,
+        scale_x: float,
+        scale_y: float,
+        transparent: bool,
+        crop: Optional[Tuple[int, int]],
+        pixel_format: str,
+    ) -> str:
+        with open(sprite_path, "rb") as sprite_file:
+            digest = hashlib.sha1(sprite_file.read()).hexdigest()
+        params = f"{scale_x!r}-{scale_y!r}-{int(transparent)}-{crop}-{pixel_format}"
+        key = hashlib.sha1(f"{digest}-{params}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.raw")
+
+    def _read(
+        self, entry_path: str, pixel_format: str, transparent: bool, convert: bool
+    ) -> Surface:
+        with open(entry_path, "rb") as entry_file:
+            pixels = mmap.mmap(entry_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, stored_format, width, height = HEADER.unpack_from(pixels)
+            if (
+                magic != MAGIC
+                or version != VERSION
+                or stored_format.rstrip(b"\0").decode() != pixel_format
+                or len(pixels) != HEADER.size + width * height * 4
+            ):
+                raise ValueError(f"Stale or corrupt sprite cache entry {entry_path}")
+
+            view = memoryview(pixels)[HEADER.size :]
+            raw = image.frombuffer(view, (width, height), pixel_format)
+            # Both copy the pixels, so the map can be closed afterwards
+            if not convert:
+                sprite = raw.copy()
+            else:
+                sprite = raw.convert_alpha() if transparent else raw.convert()
+            del raw
+            view.release()
+        finally:
+            pixels.close()
+
+        return sprite
+
+    def _write(self, entry_path: str, sprite: Surface, pixel_format: str) -> None:
+        width, height = sprite.get_size()
+        header = HEADER.pack(MAGIC, VERSION, pixel_format.encode(), width, height)
+        with atomic_write(entry_path) as entry_file:
+            entry_file.write(header)
+            entry_file.write(_tobytes(sprite, pixel_format))
+
+    def load(
+        self,
+        sprite_path: str,
+        transparent: bool = False,
+        scale_x: Optional[SupportsFloat] = None,
+        scale_y: Optional[SupportsFloat] = None,
+        crop: Optional[Tuple[int, int]] = None,
+        convert: bool = True,
+    ) -> Surface:
+        """Load a scaled sprite, from the cache if possible.
+
+        With convert disabled no display access is needed, so the sprite can
+        be loaded on a worker thread and converted on the main thread later.
+
+        Args:
+            sprite_path (str): The path to sprite.
+            transparent (bool): Load the sprite as transparent.\
+                Defaults to False.
+            scale_x (Optional[SupportsFloat]): X scaling factor. Defaults to 1.0.
+            scale_y (Optional[SupportsFloat]): Y scaling factor. Defaults to 1.0.
+            crop (Optional[Tuple[int, int]]): Only keep the top left area of\
+                this size after scaling, e.g. the part of a background that\
+                fits on screen.
+            convert (bool): Convert the sprite to the display's format.\
+                Defaults to True.
+
+        Returns:
+            Surface: Surface instance of the loaded sprite, not shared.
+        """
+
+        scale_x = float(scale_x or 1.0)
+        scale_y = float(scale_y or 1.0)
+        crop = tuple(crop) if crop else None
+        pixel_format = _display_format(transparent)
+
+        try:
+            entry_path = self._entry_path(
+                sprite_path, scale_x, scale_y, transparent, crop, pixel_format
+            )
+        except OSError:
+            logger.warning(f"Unable to read sprite {sprite_path}.", exc_info=True)
+            return Surface((1, 1))
+
+        if os.path.exists(entry_path):
+            try:
+                return self._read(entry_path, pixel_format, transparent, convert)
+            except (OSError, ValueError, error):
+                logger.warning("Discarding unreadable sprite cache entry.", exc_info=True)
+
+        try:
+            sprite = image.load(sprite_path)
+            width, height = sprite.get_size()
+            sprite = transform.scale(
+                sprite, (int(width * scale_x), int(height * scale_y))
+            )
+        except error:
+            logger.warning(
+                "Unable to load sprite. Loading default surface.", exc_info=True
+            )
+            return Surface((1, 1))
+
+        if crop:
+            sprite = sprite.subsurface(sprite.get_rect().clip(Rect((0, 0), crop))).copy()
+        if convert:
+            sprite = sprite.convert_alpha() if transparent else sprite.convert()
+
+        try:
+            self._write(entry_path, sprite, pixel_format)
+        except OSError:
+            logger.warning("Unable to write sprite cache entry.", exc_info=True)
+
+        return sprite
@@ -0,0 +1,237 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from dataclasses import dataclass, replace
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from pygame import draw, Rect, Surface, SRCALPHA
+
+from core.ui.sprite_cache import SpriteCache
+
+Color = Tuple[int, int, int]
+Point = Tuple[float, float]
+
+# Regular polygons by number of corners, rotated so they stand on a flat side
+POLYGON_CORNERS = {"triangle": 3, "square": 4, "pentagon": 5, "hexagon": 6, "octagon": 8}
+SHAPE_KINDS = (
+    "circle",
+    "oval",
+    "rectangle",
+    "diamond",
+    "star",
+    *POLYGON_CORNERS,
+)
+
+SHAPE_COLORS = {
+    "red": (230, 57, 70),
+    "orange": (244, 162, 97),
+    "yellow": (233, 196, 106),
+    "green": (42, 157, 143),
+    "blue": (69, 123, 157),
+    "purple": (131, 56, 236),
+    "pink": (255, 112, 166),
+    "brown": (141, 100, 72),
+}
+
+
+@dataclass(frozen=True)
+class ShapeSpec:
+    """Parameters of a shape, also used as its cache key"""
+
+    kind: str
+    size: int
+    color: Color
+    # Degrees, counter-clockwise
+    rotation: float = 0.0
+    outline: Optional[Color] = None
+    outline_width: int = 0
+
+    def normalized(self) -> "ShapeSpec":
+        """Return an equal-looking spec with rotation reduced by the shape's symmetry,
+        so e.g. a square rotated by 90 degrees shares the cache entry of one at 0"""
+
+        if self.kind == "circle":
+            return replace(self, rotation=0.0)
+
+        period = {"oval": 180, "rectangle": 180, "diamond": 180, "star": 72}.get(
+            self.kind, 360 / POLYGON_CORNERS.get(self.kind, 1)
+        )
+        return replace(self, rotation=round(self.rotation % period, 1))
+
+
+def _regular_polygon(corners: int, radius: float, rotation: float) -> List[Point]:
+    # Start at the top, offset so an even polygon sits on a flat side
+    start = -math.pi / 2 + (math.pi / corners if corners % 2 == 0 else 0)
+    return [
+        (
+            radius * math.cos(start + rotation + 2 * math.pi * i / corners),
+            radius * math.sin(start + rotation + 2 * math.pi * i / corners),
+        )
+        for i in range(corners)
+    ]
+
+
+def _rotated(points: Sequence[Point], rotation: float) -> List[Point]:
+    cos, sin = math.cos(rotation), math.sin(rotation)
+    return [(x * cos - y * sin, x * sin + y * cos) for x, y in points]
+
+
+def shape_points(kind: str, size: int, rotation: float = 0.0) -> List[Point]:
+    """Return the outline of a shape centred on the origin
+
+    Args:
+        kind (str): One of SHAPE_KINDS, except circle.
+        size (int): Width and height of the box the shape fits in.
+        rotation (float): Degrees, counter-clockwise. Defaults to 0.
+
+    Returns:
+        List[Point]: Corner points.
+    """
+
+    radius = size / 2
+    # Screen y points down, so negate to rotate counter-clockwise
+    angle = -math.radians(rotation)
+
+    if kind in POLYGON_CORNERS:
+        return _regular_polygon(POLYGON_CORNERS[kind], radius, angle)
+
+    if kind == "star":
+        outer = _regular_polygon(5, radius, angle)
+        inner = _regular_polygon(5, radius * 0.4, angle + math.pi / 5)
+        return [point for pair in zip(outer, inner) for point in pair]
+
+    if kind == "rectangle":
+        half_height = radius * 0.6
+        corners = [(-radius, -half_height), (radius, -half_height)]
+        corners += [(radius, half_height), (-radius, half_height)]
+        return _rotated(corners, angle)
+
+    if kind == "diamond":
+        return _rotated(
+            [(0, -radius), (radius * 0.7, 0), (0, radius), (-radius * 0.7, 0)], angle
+        )
+
+    if kind == "oval":
+        return _rotated(
+            [
+                (radius * math.cos(t), radius * 0.6 * math.sin(t))
+                for t in (2 * math.pi * i / 48 for i in range(48))
+            ],
+            angle,
+        )
+
+    raise ValueError(f"Unknown shape kind {kind}")
+
+
+class ShapeRenderer:
+    """Rasterizes shapes with pygame.draw and caches them by their parameters"""
+
+    def __init__(self, budget: int = 8 * 1024 * 1024) -> None:
+        """Create a renderer
+
+        Args:
+            budget (int): Maximum bytes of rasterized shapes kept.\
+                Defaults to 8 MiB.
+        """
+
+        self.cache = SpriteCache(budget)
+
+    def _rasterize(self, spec: ShapeSpec) -> Surface:
+        surface = Surface((spec.size, spec.size), SRCALPHA)
+        center = spec.size / 2
+
+        if spec.kind == "circle":
+            radius = spec.size // 2
+            draw.circle(surface, spec.color, (radius, radius), radius)
+            if spec.outline and spec.outline_width:
+                draw.circle(
+                    surface, spec.outline, (radius, radius), radius, spec.outline_width
+                )
+            return surface
+
+        # Leave room for the outline so it is not clipped
+        inset = spec.outline_width if spec.outline else 0
+        points = [
+            (center + x, center + y)
+            for x, y in shape_points(spec.kind, spec.size - 2 * inset - 1, spec.rotation)
+        ]
+        draw.polygon(surface, spec.color, points)
+        # Antialiased edge in the fill color smooths the jagged polygon
+        draw.aalines(surface, spec.color, True, points)
+        if spec.outline and spec.outline_width:
+            draw.polygon(surface, spec.outline, points, spec.outline_width)
+        return surface
+
+    def render(self, spec: ShapeSpec) -> Surface:
+        """Return the rasterized shape, drawing it only on a cache miss
+
+        Args:
+            spec (ShapeSpec): The shape.
+
+        Returns:
+            Surface: Shared transparent surface of spec.size squared.\
+                Must not be drawn on.
+        """
+
+        spec = spec.normalized()
+        surface = self.cache.get(spec)
+        if surface is None:
+            surface = self._rasterize(spec)
+            self.cache.put(spec, surface)
+        return surface
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache statistics"""
+
+        return self.cache.stats()
+
+
+class ShapeWidget:
+    """Widget showing a procedurally drawn shape"""
+
+    def __init__(
+        self,
+        spec: ShapeSpec,
+        x: float,
+        y: float,
+        renderer: Optional[ShapeRenderer] = None,
+    ) -> None:
+        """Create a shape widget centred on a point
+
+        Args:
+            spec (ShapeSpec): The shape.
+            x (float): X coordinate of the centre.
+            y (float): Y coordinate of the centre.
+            renderer (Optional[ShapeRenderer]): Renderer to draw with.\
+                Defaults to the shared shape_renderer.
+        """
+
+        self.spec = spec
+        self.surface = (renderer or shape_renderer).render(spec)
+        self.rect = Rect(0, 0, spec.size, spec.size)
+        self.rect.center = (int(x), int(y))
+        self.dirty = True
+
+
+# Shared by every shape widget
+shape_renderer = ShapeRenderer()
@@ -0,0 +1,180 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from collections import defaultdict
+from itertools import count
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+from pygame import Rect
+
+
+class SpatialGrid:
+    """Uniform grid index of interactive widgets for fast hit-testing.
+
+    Every item is stored in each grid cell its rect overlaps, so a point query
+    only looks at the handful of items in a single cell no matter how many
+    items are on screen. Hits are returned topmost first, by z and then by
+    insertion order.
+    """
+
+    def __init__(self, cell_size: int = 64) -> None:
+        """Create an empty grid
+
+        Args:
+            cell_size (int): Width and height of a cell in pixels. Defaults to 64.
+        """
+
+        self.cell_size = max(1, int(cell_size))
+        self._cells: Dict[Tuple[int, int], Set[Hashable]] = defaultdict(set)
+        # item -> (rect, z, insertion order, cells)
+        self._items: Dict[Hashable, Tuple[Rect, float, int, Tuple]] = {}
+        self._order = count()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._items
+
+    def _cells_for(self, rect: Rect) -> Tuple[Tuple[int, int], ...]:
+        """Return the cells a rect overlaps"""
+
+        size = self.cell_size
+        left, top = rect.left // size, rect.top // size
+        right, bottom = (rect.right - 1) // size, (rect.bottom - 1) // size
+        return tuple(
+            (x, y) for x in range(left, right + 1) for y in range(top, bottom + 1)
+        )
+
+    def insert(self, item: Hashable, rect: Rect, z: float = 0) -> None:
+        """Add an item, or move it if it is already indexed
+
+        Args:
+            item (Hashable): The item, usually a widget.
+            rect (Rect): Area the item covers on screen.
+            z (float): Stacking order, higher is on top. Defaults to 0.
+        """
+
+        if item in self._items:
+            self.update(item, rect, z)
+            return
+
+        rect = Rect(rect)
+        cells = self._cells_for(rect)
+        for cell in cells:
+            self._cells[cell].add(item)
+        self._items[item] = (rect, z, next(self._order), cells)
+
+    def update(
+        self, item: Hashable, rect: Optional[Rect] = None, z: Optional[float] = None
+    ) -> None:
+        """Move an item or change its stacking order.
+
+        Only the cells the item enters or leaves are touched.
+
+        Args:
+            item (Hashable): An indexed item.
+            rect (Optional[Rect]): New area. Unchanged by default.
+            z (Optional[float]): New stacking order. Unchanged by default.
+        """
+
+        old_rect, old_z, order, old_cells = self._items[item]
+        rect = old_rect if rect is None else Rect(rect)
+        z = old_z if z is None else z
+
+        cells = old_cells
+        if rect != old_rect:
+            cells = self._cells_for(rect)
+            if cells != old_cells:
+                for cell in set(old_cells).difference(cells):
+                    self._discard(cell, item)
+                for cell in set(cells).difference(old_cells):
+                    self._cells[cell].add(item)
+
+        self._items[item] = (rect, z, order, cells)
+
+    def remove(self, item: Hashable) -> None:
+        """Remove an item if it is indexed
+
+        Args:
+            item (Hashable): The item.
+        """
+
+        entry = self._items.pop(item, None)
+        if entry:
+            for cell in entry[3]:
+                self._discard(cell, item)
+
+    def clear(self) -> None:
+        """Remove every item"""
+
+        self._cells.clear()
+        self._items.clear()
+
+    def _discard(self, cell: Tuple[int, int], item: Hashable) -> None:
+        items = self._cells[cell]
+        items.discard(item)
+        if not items:
+            del self._cells[cell]
+
+    def _sorted(self, items) -> List[Hashable]:
+        """Order items topmost first"""
+
+        return sorted(
+            items, key=lambda item: self._items[item][1:3], reverse=True
+        )
+
+    def query_point(self, pos: Tuple[int, int]) -> List[Hashable]:
+        """Return the items covering a point, topmost first
+
+        Args:
+            pos (Tuple[int, int]): The point.
+
+        Returns:
+            List[Hashable]: Items whose rect contains the point.
+        """
+
+        size = self.cell_size
+        candidates = self._cells.get((int(pos[0]) // size, int(pos[1]) // size))
+        if not candidates:
+            return []
+        return self._sorted(
+            item for item in candidates if self._items[item][0].collidepoint(pos)
+        )
+
+    def query_rect(self, rect: Rect) -> List[Hashable]:
+        """Return the items overlapping an area, topmost first
+
+        Args:
+            rect (Rect): The area.
+
+        Returns:
+            List[Hashable]: Items whose rect overlaps the area.
+        """
+
+        rect = Rect(rect)
+        candidates = set()
+        for cell in self._cells_for(rect):
+            candidates.update(self._cells.get(cell, ()))
+        return self._sorted(
+            item for item in candidates if self._items[item][0].colliderect(rect)
+        )
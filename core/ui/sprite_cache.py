@@ -0,0 +1,144 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+from pygame import Surface
+
+from core.utils import logger
+
+
+def surface_size(surface: Surface) -> int:
+    """Return the number of bytes of pixel data held by a surface"""
+
+    return surface.get_pitch() * surface.get_height()
+
+
+class SpriteCache:
+    """Least recently used cache of loaded surfaces with a memory budget.
+
+    Cached surfaces are shared between every caller asking for the same key,
+    so they must not be drawn on.
+    """
+
+    def __init__(self, budget: int = 16 * 1024 * 1024) -> None:
+        """Create an empty cache
+
+        Args:
+            budget (int): Maximum bytes of pixel data kept. Defaults to 16 MiB.
+        """
+
+        self.budget = budget
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._surfaces: "OrderedDict[Hashable, Surface]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._surfaces
+
+    def get(self, key: Hashable) -> Optional[Surface]:
+        """Return a cached surface and mark it as recently used
+
+        Args:
+            key (Hashable): Cache key.
+
+        Returns:
+            Optional[Surface]: The surface, or None on a miss.
+        """
+
+        surface = self._surfaces.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+
+        self._surfaces.move_to_end(key)
+        self.hits += 1
+        return surface
+
+    def put(self, key: Hashable, surface: Surface) -> None:
+        """Cache a surface, evicting least recently used ones to stay in budget
+
+        Args:
+            key (Hashable): Cache key.
+            surface (Surface): Surface to cache.
+        """
+
+        size = surface_size(surface)
+        if size > self.budget:
+            logger.debug(f"Not caching {key}, {size} bytes exceed the budget")
+            return
+
+        self.discard(key)
+        self._surfaces[key] = surface
+        self.size += size
+        self._shrink(self.budget)
+
+    def discard(self, key: Hashable) -> None:
+        """Drop a surface from the cache if present"""
+
+        surface = self._surfaces.pop(key, None)
+        if surface is not None:
+            self.size -= surface_size(surface)
+
+    def _shrink(self, budget: int) -> None:
+        while self.size > budget:
+            _, surface = self._surfaces.popitem(last=False)
+            self.size -= surface_size(surface)
+            self.evictions += 1
+
+    def set_budget(self, budget: int) -> None:
+        """Change the budget, evicting surfaces if it shrank
+
+        Args:
+            budget (int): Maximum bytes of pixel data kept.
+        """
+
+        self.budget = budget
+        self._shrink(budget)
+
+    def clear(self) -> None:
+        """Drop every surface. Statistics are kept."""
+
+        self._surfaces.clear()
+        self.size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit, miss and eviction counts and memory use"""
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._surfaces),
+            "bytes": self.size,
+            "budget": self.budget,
+        }
+
+
+# Shared by every load_sprite call
+sprite_cache = SpriteCache()
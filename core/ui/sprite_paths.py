@@ -20,7 +20,10 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-"""Makeshift File to store all paths to sprites"""
-# TODO: find a better way to store sprite paths
+"""Paths of the files bundled with the game.
+
+Code should refer to assets by their logical name in core.ui.assets instead.
+"""
 
 GAME_BACKGROUND_PATH = "./sprites/background.png"
+ROBOTO_FONT_PATH = "./fonts/Roboto.ttf"
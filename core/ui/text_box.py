@@ -27,7 +27,8 @@ from pygame.font import Font
 from pygame.color import Color
 
 
-from core.ui.fonts import GameFont
+from core.ui.fonts import GameFont, resolve_font
+from core.ui.text_cache import text_cache
 from core.utils import logger
 
 
@@ -56,13 +57,14 @@ class TextBox:
         """
 
         self.label = label
-        self.font = font
+        self.font = resolve_font(font)
         self.color = color
         self.background_color = background_color
 
         # Render Text Box
         try:
-            self.text_box = self.font.render(
+            self.text_box = text_cache.render(
+                self.font,
                 label,
                 True,
                 ((0, 0, 0) or self.color),
@@ -74,3 +76,10 @@ class TextBox:
 
         self.rect = self.text_box.get_rect()
         self.rect.x, self.rect.y = x - self.rect.width / 2, y
+        self.dirty = True
+
+    @property
+    def surface(self) -> Surface:
+        """Surface currently shown for the text box"""
+
+        return self.text_box
@@ -0,0 +1,109 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from typing import Dict, Optional, Tuple, Union
+
+from pygame import Surface
+from pygame.color import Color
+from pygame.font import Font
+
+from core.ui.sprite_cache import SpriteCache
+
+ColorValue = Union[Color, str, int, Tuple[int, ...]]
+
+
+def _color_key(color: Optional[ColorValue]) -> Optional[Tuple[int, ...]]:
+    """Hashable form of any color value pygame accepts"""
+
+    if color is None:
+        return None
+    return tuple(Color(color))
+
+
+class TextCache:
+    """Least recently used cache of rendered text surfaces.
+
+    Keys are (text, font, size, antialias, color, background), so widgets
+    showing the same label in the same style share a single surface.
+    """
+
+    def __init__(self, budget: int = 2 * 1024 * 1024) -> None:
+        """Create an empty cache
+
+        Args:
+            budget (int): Maximum bytes of rendered text kept. Defaults to 2 MiB.
+        """
+
+        self.cache = SpriteCache(budget)
+
+    def render(
+        self,
+        font: Font,
+        text: str,
+        antialias: bool = True,
+        color: ColorValue = (0, 0, 0),
+        background: Optional[ColorValue] = None,
+    ) -> Surface:
+        """Render text, or return the cached surface of an earlier render
+
+        Args:
+            font (Font): Font for rendering the text.
+            text (str): The text.
+            antialias (bool): Smooth the glyph edges. Defaults to True.
+            color (ColorValue): Text color. Defaults to black.
+            background (Optional[ColorValue]): Background color.\
+                Transparent by default.
+
+        Returns:
+            Surface: Shared surface. Must not be drawn on.
+        """
+
+        key = (
+            text,
+            font,
+            getattr(font, "point_size", None),
+            bool(antialias),
+            _color_key(color),
+            _color_key(background),
+        )
+        surface = self.cache.get(key)
+        if surface is None:
+            surface = font.render(text, antialias, color, background)
+            self.cache.put(key, surface)
+        return surface
+
+    def clear(self) -> None:
+        """Drop every cached surface, e.g. after the fonts were replaced"""
+
+        self.cache.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Return cache statistics including the hit rate"""
+
+        stats = self.cache.stats()
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+# Shared by every widget
+text_cache = TextCache()
@@ -1 +1,5 @@
-from .logger import logger
\ No newline at end of file
+from .logger import logger
+from .frame_scheduler import FrameScheduler
+from .profiler import FrameProfiler, NullProfiler
+from .localization import N_, strings, StringTable
+from .files import atomic_write
@@ -0,0 +1,150 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import time
+from typing import Callable, Optional
+
+
+class FrameScheduler:
+    """Paces the game loop with a fixed update step and a variable render rate.
+
+    Game logic advances in fixed steps of ``1 / update_hz`` seconds, while
+    frames are rendered at most ``target_fps`` times per second. When nothing
+    on screen has changed for ``idle_after`` seconds the scheduler drops to
+    ``idle_fps`` until it is woken up again.
+    """
+
+    def __init__(
+        self,
+        target_fps: float = 30,
+        update_hz: Optional[float] = None,
+        idle_fps: float = 4,
+        idle_after: float = 1.0,
+        max_updates: int = 5,
+        clock: Callable[[], float] = time.perf_counter,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Create a frame scheduler
+
+        Args:
+            target_fps (float): Frames per second while active. 0 disables\
+                frame pacing entirely. Defaults to 30.
+            update_hz (Optional[float]): Fixed update steps per second.\
+                Defaults to target_fps, or 30 when pacing is disabled.
+            idle_fps (float): Frames per second while idle. Defaults to 4.
+            idle_after (float): Seconds without changes before going idle.\
+                Defaults to 1.0.
+            max_updates (int): Maximum update steps run in a single frame,\
+                so a long stall does not snowball. Defaults to 5.
+            clock (Callable[[], float]): Monotonic clock in seconds.
+            sleep (Callable[[float], None]): Function used to wait.
+        """
+
+        self.target_fps = target_fps
+        self.idle_fps = idle_fps
+        self.idle_after = idle_after
+        self.max_updates = max_updates
+        self.step = 1.0 / (update_hz or target_fps or 30)
+
+        self._clock = clock
+        self._sleep = sleep
+
+        now = self._clock()
+        self._frame_start = now
+        self._last_change = now
+        self._accumulator = 0.0
+        self.frame_time = 0.0
+        self.idle = False
+
+    @property
+    def alpha(self) -> float:
+        """Fraction of an update step left over after the last frame's updates,
+        for interpolating the render between two logic states"""
+
+        return self._accumulator / self.step
+
+    @property
+    def frame_interval(self) -> float:
+        """Seconds between the start of two consecutive frames"""
+
+        fps = self.idle_fps if self.idle else self.target_fps
+        return 1.0 / fps if fps else 0.0
+
+    def begin_frame(self) -> int:
+        """Start a new frame
+
+        Returns:
+            int: Number of fixed update steps to run this frame.
+        """
+
+        now = self._clock()
+        self.frame_time = now - self._frame_start
+        self._frame_start = now
+
+        if self.idle:
+            # Time spent idle is not simulated, nothing was moving anyway
+            self._accumulator = 0.0
+            return 0
+
+        self._accumulator += self.frame_time
+        updates = int(self._accumulator / self.step)
+        if updates > self.max_updates:
+            updates = self.max_updates
+            self._accumulator = 0.0
+        else:
+            self._accumulator -= updates * self.step
+
+        return updates
+
+    def end_frame(self, changed: bool = False) -> None:
+        """Finish the current frame and wait until the next one is due
+
+        Args:
+            changed (bool): Whether anything on screen changed this frame.\
+                Defaults to False.
+        """
+
+        now = self._clock()
+        if changed:
+            self.wake(now)
+        elif not self.idle and now - self._last_change >= self.idle_after:
+            self.idle = True
+
+        if not self.target_fps:
+            return
+
+        remaining = self._frame_start + self.frame_interval - now
+        # Always give up the CPU, even when the frame ran late
+        self._sleep(max(remaining, 0.0))
+
+    def wake(self, now: Optional[float] = None) -> None:
+        """Leave idle mode, e.g. on user input
+
+        Args:
+            now (Optional[float]): Current clock time. Read from the clock\
+                by default.
+        """
+
+        self._last_change = self._clock() if now is None else now
+        if self.idle:
+            self.idle = False
+            self._frame_start = self._last_change
@@ -0,0 +1,144 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import gettext
+from typing import Dict, Mapping, Optional, Sequence
+
+from core.utils.logger import logger
+
+
+def N_(message: str) -> str:
+    """Mark a string for translation without translating it yet.
+
+    Import it as ``_`` so xgettext's default keywords pick the string up.
+
+    Args:
+        message (str): The untranslated string.
+
+    Returns:
+        str: The same string.
+    """
+
+    return message
+
+
+class StringTable:
+    """Translated UI strings for the active locale.
+
+    The catalog is looked up once when the table is first used or the
+    language changes, and every translated string is kept, so resolving a
+    label never touches the catalog lookup of ``gettext.gettext`` again.
+    """
+
+    def __init__(
+        self,
+        domain: Optional[str] = None,
+        localedir: Optional[str] = None,
+        languages: Optional[Sequence[str]] = None,
+    ) -> None:
+        """Create a string table, the catalog is loaded on first use
+
+        Args:
+            domain (Optional[str]): Message domain. Defaults to the current\
+                text domain, which Sugar sets to the bundle id.
+            localedir (Optional[str]): Directory of the compiled catalogs.\
+                Defaults to where the domain is bound.
+            languages (Optional[Sequence[str]]): Languages in order of\
+                preference. Defaults to the locale environment variables.
+        """
+
+        self.domain = domain
+        self.localedir = localedir
+        self.languages = tuple(languages) if languages else None
+        # Changes every time the language changes
+        self.version = 0
+        self._translation: Optional[gettext.NullTranslations] = None
+        self._table: Dict[str, str] = {}
+
+    def _load(self) -> gettext.NullTranslations:
+        """Load the catalog for the active languages"""
+
+        domain = self.domain or gettext.textdomain()
+        localedir = self.localedir or gettext.bindtextdomain(domain)
+        self._translation = gettext.translation(
+            domain, localedir, self.languages, fallback=True
+        )
+        logger.debug(
+            f"Loaded {self.language} strings for {domain} from {localedir}"
+        )
+        return self._translation
+
+    @property
+    def language(self) -> str:
+        """Language of the loaded catalog, "C" when there is none"""
+
+        if self._translation is None:
+            self._load()
+        return self._translation.info().get("language", "C")
+
+    def set_language(self, languages: Optional[Sequence[str]] = None) -> None:
+        """Switch to another language
+
+        Args:
+            languages (Optional[Sequence[str]]): Languages in order of\
+                preference. None for the locale environment variables.
+        """
+
+        languages = tuple(languages) if languages else None
+        if languages == self.languages and self._translation is not None:
+            return
+        self.languages = languages
+        self._table.clear()
+        self._load()
+        self.version += 1
+
+    def get(self, message: str) -> str:
+        """Return the translation of a string
+
+        Args:
+            message (str): The untranslated string.
+
+        Returns:
+            str: The translation, or the string itself when it has none.
+        """
+
+        translated = self._table.get(message)
+        if translated is None:
+            translation = self._translation or self._load()
+            translated = self._table[message] = translation.gettext(message)
+        return translated
+
+    def resolve(self, messages: Mapping[str, str]) -> Dict[str, str]:
+        """Translate a batch of strings, e.g. every label of a scene
+
+        Args:
+            messages (Mapping[str, str]): Untranslated strings by key.
+
+        Returns:
+            Dict[str, str]: Translations by the same keys.
+        """
+
+        return {key: self.get(message) for key, message in messages.items()}
+
+
+# Shared by every scene
+strings = StringTable()
@@ -1,6 +1,6 @@
 from datetime import datetime
 import logging
-from os import path
+from os import makedirs, path
 
 
 LOG_FORMAT = "[%(asctime)s] %(levelname)-8s %(name)-12s %(message)s"
@@ -8,6 +8,7 @@ LOG_FORMAT = "[%(asctime)s] %(levelname)-8s %(name)-12s %(message)s"
 DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 # SHORT_DATE_FORMAT = "%Y-%m-%d_%H-%M-%S"
 
+makedirs("./logs", exist_ok=True)
 logging.basicConfig(
     level=logging.DEBUG,
     filename=path.join(
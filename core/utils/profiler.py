@@ -0,0 +1,192 @@
+# MIT License
+#
+# Copyright (c) 2024 zen0-5338
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, 8and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from array import array
+import csv
+import json
+import time
+from typing import Callable, Dict, Iterable, List, Sequence
+
+
+class FrameProfiler:
+    """Times each phase of a frame into a fixed-size ring buffer.
+
+    Call ``begin_frame`` at the start of a frame, ``mark`` after every phase
+    and ``end_frame`` once the frame's work is done. Only the last
+    ``capacity`` frames are kept.
+    """
+
+    enabled = True
+
+    PHASES = ("callbacks", "gtk", "events", "update", "render", "preload")
+
+    def __init__(
+        self,
+        capacity: int = 600,
+        phases: Sequence[str] = PHASES,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """Create a profiler
+
+        Args:
+            capacity (int): Number of frames kept. Defaults to 600.
+            phases (Sequence[str]): Names of the timed phases, in order.
+            clock (Callable[[], float]): Clock in seconds.
+        """
+
+        self.capacity = capacity
+        self.phases = tuple(phases)
+        self._clock = clock
+
+        # One preallocated buffer per column so recording never allocates
+        self._phase_times = {phase: array("d", bytes(8 * capacity)) for phase in phases}
+        self._frame_times = array("d", bytes(8 * capacity))
+        self._intervals = array("d", bytes(8 * capacity))
+
+        self._index = 0
+        self.count = 0
+        self._frame_start = None
+        self._last_mark = 0.0
+
+    def begin_frame(self) -> None:
+        """Start timing a frame"""
+
+        now = self._clock()
+        if self._frame_start is not None:
+            self._intervals[self._index] = now - self._frame_start
+        self._frame_start = self._last_mark = now
+        for phase in self.phases:
+            self._phase_times[phase][self._index] = 0.0
+
+    def mark(self, phase: str) -> None:
+        """Attribute the time since the previous mark to a phase
+
+        Args:
+            phase (str): Name of the phase that just finished.
+        """
+
+        now = self._clock()
+        self._phase_times[phase][self._index] += now - self._last_mark
+        self._last_mark = now
+
+    def end_frame(self) -> None:
+        """Finish timing a frame"""
+
+        self._frame_times[self._index] = self._clock() - self._frame_start
+        self._index = (self._index + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def _ordered(self, column: array) -> List[float]:
+        """Return recorded values of a column, oldest first"""
+
+        if self.count < self.capacity:
+            return column[: self.count].tolist()
+        return (column[self._index :] + column[: self._index]).tolist()
+
+    @staticmethod
+    def _percentile(values: List[float], percent: float) -> float:
+        """Nearest-rank percentile of sorted values"""
+
+        if not values:
+            return 0.0
+        rank = int(round(percent / 100 * (len(values) - 1)))
+        return values[rank]
+
+    def summary(self, percentiles: Iterable[float] = (50, 95, 99)) -> Dict:
+        """Summarise the recorded frames
+
+        Args:
+            percentiles (Iterable[float]): Frame time percentiles to compute.
+
+        Returns:
+            Dict: FPS, frame time percentiles and mean time per phase,\
+                all times in seconds.
+        """
+
+        frame_times = sorted(self._ordered(self._frame_times))
+        # The very first frame has no previous frame to measure from
+        intervals = [value for value in self._ordered(self._intervals) if value]
+        mean_interval = sum(intervals) / len(intervals) if intervals else 0.0
+
+        return {
+            "frames": self.count,
+            "fps": 1.0 / mean_interval if mean_interval else 0.0,
+            "frame_time": {
+                f"p{percent:g}": self._percentile(frame_times, percent)
+                for percent in percentiles
+            },
+            "phases": {
+                phase: sum(self._ordered(self._phase_times[phase])) / self.count
+                if self.count
+                else 0.0
+                for phase in self.phases
+            },
+        }
+
+    def rows(self) -> List[Dict[str, float]]:
+        """Return every recorded frame as a row, oldest first"""
+
+        columns = {
+            "frame_time": self._ordered(self._frame_times),
+            "interval": self._ordered(self._intervals),
+        }
+        for phase in self.phases:
+            columns[phase] = self._ordered(self._phase_times[phase])
+
+        return [
+            {name: values[i] for name, values in columns.items()}
+            for i in range(self.count)
+        ]
+
+    def export(self, path: str) -> None:
+        """Write the recorded frames to a file
+
+        Args:
+            path (str): Output path. Written as CSV if it ends with .csv,\
+                as JSON with a summary otherwise.
+        """
+
+        rows = self.rows()
+        with open(path, "w", newline="") as export_file:
+            if path.lower().endswith(".csv"):
+                writer = csv.DictWriter(
+                    export_file, fieldnames=["frame_time", "interval", *self.phases]
+                )
+                writer.writeheader()
+                writer.writerows(rows)
+            else:
+                json.dump({"summary": self.summary(), "frames": rows}, export_file)
+
+
+class NullProfiler:
+    """Profiler used when profiling is disabled. Every method does nothing."""
+
+    enabled = False
+
+    def begin_frame(self) -> None:
+        pass
+
+    def mark(self, phase: str) -> None:
+        pass
+
+    def end_frame(self) -> None:
+        pass
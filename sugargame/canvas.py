@@ -20,6 +20,7 @@
 # SOFTWARE.
 #
 
+import io
 import os
 from gi.repository import Gtk
 from gi.repository import GLib
@@ -44,6 +45,7 @@ class PygameCanvas(Gtk.EventBox):
         self._activity = activity
         self._main = main
         self._modules = modules
+        self._preview = None
 
         self.set_can_focus(True)
 
@@ -69,6 +71,7 @@ class PygameCanvas(Gtk.EventBox):
 
         # Hook certain Pygame functions with GTK equivalents.
         self.translator.hook_pygame()
+        self._hook_display()
 
         # Call the caller's main loop as an idle source
         if self._main:
@@ -77,9 +80,32 @@ class PygameCanvas(Gtk.EventBox):
     def get_pygame_widget(self):
         return self._socket
 
+    def _hook_display(self):
+        """Drop the cached preview whenever a new frame reaches the screen"""
+
+        flip = pygame.display.flip
+        update = pygame.display.update
+
+        def _flip():
+            self._preview = None
+            return flip()
+
+        def _update(*args):
+            self._preview = None
+            return update(*args)
+
+        pygame.display.flip = _flip
+        pygame.display.update = _update
+
+    def invalidate_preview(self):
+        """Make the next get_preview render the screen again"""
+
+        self._preview = None
+
     def get_preview(self):
         """
-        Return preview of main surface
+        Return preview of main surface, as PNG data
+        The preview is encoded in memory and kept until the screen changes.
         How to use in activity:
             def get_preview(self):
                 return self.game_canvas.get_preview()
@@ -88,17 +114,10 @@ class PygameCanvas(Gtk.EventBox):
         if not hasattr(self, "_screen"):
             return None
 
-        _tmp_dir = os.path.join(self._activity.get_activity_root(), "tmp")
-        _file_path = os.path.join(_tmp_dir, "preview.png")
-
-        width = PREVIEW_SIZE[0]
-        height = PREVIEW_SIZE[1]
-        _surface = pygame.transform.scale(self._screen, (width, height))
-        pygame.image.save(_surface, _file_path)
-
-        f = open(_file_path, "rb")
-        preview = f.read()
-        f.close()
-        os.remove(_file_path)
+        if self._preview is None:
+            _surface = pygame.transform.scale(self._screen, PREVIEW_SIZE)
+            _buffer = io.BytesIO()
+            pygame.image.save(_surface, _buffer, "preview.png")
+            self._preview = _buffer.getvalue()
 
-        return preview
+        return self._preview